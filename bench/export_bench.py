@@ -0,0 +1,142 @@
+"""
+Export benchmark: a month of runs as pretty-printed JSON vs partitioned Parquet.
+
+Generates synthetic runs from the recorded detail fixtures, writes each run
+the old way (grand_jobs_list.json, indent=2) and through
+utils.parquet_export, then times loading the whole month with pandas the
+way the notebook does against read_runs(), with and without a filter.
+
+    python -m bench.export_bench
+    python -m bench.export_bench --runs 30 --jobs-per-run 3000 --keep /tmp/month
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bench.run_bench import RESULTS_DIR, build_db_records, git_commit, summarize
+from bench.server import load_manifest
+
+COMPANIES = 40
+
+
+def synthetic_runs(manifest, runs, jobs_per_run):
+    """[(run_id, run_datetime, [JobData])] for `runs` consecutive nights"""
+    from core.job_detail_model import to_jobs
+
+    started = datetime(2025, 6, 1, 21, 40)
+    result = []
+    for n in range(runs):
+        records = build_db_records(manifest, jobs_per_run)
+        for i, record in enumerate(records):
+            record["companyName"] = f"Company {i % COMPANIES}"
+            record["country"] = ("United States", "Canada", "United Kingdom", "India")[i % 4]
+            record["postedDate"] = (started - timedelta(days=i % 60)).isoformat()
+        when = started + timedelta(days=n)
+        result.append((f"{when:%Y%m%dT%H%M%S}-bench", when, to_jobs(records)))
+    return result
+
+
+def write_month(runs, root):
+    from utils.parquet_export import export_run
+
+    json_dir = os.path.join(root, "json")
+    parquet_dir = os.path.join(root, "exports")
+    os.makedirs(json_dir, exist_ok=True)
+    timings = {"json_write": [], "parquet_write": []}
+    for run_id, when, jobs in runs:
+        t0 = time.perf_counter()
+        with open(os.path.join(json_dir, f"grand_jobs_list.{run_id}.json"), "w", encoding="utf-8") as f:
+            json.dump([job.model_dump() for job in jobs], f, indent=2, ensure_ascii=False)
+        timings["json_write"].append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        export_run(jobs, run_id, root=parquet_dir, now=when)
+        timings["parquet_write"].append(time.perf_counter() - t0)
+    return json_dir, parquet_dir, timings
+
+
+def directory_size(path):
+    return sum(os.path.getsize(f) for f in glob.glob(os.path.join(path, "**", "*"), recursive=True) if os.path.isfile(f))
+
+
+def time_reads(json_dir, parquet_dir, rounds):
+    import pandas as pd
+    import pyarrow.dataset as ds
+
+    from utils.parquet_export import read_runs
+
+    readers = {
+        "json_pandas": lambda: pd.concat(
+            [pd.read_json(path) for path in sorted(glob.glob(os.path.join(json_dir, "*.json")))]
+        ),
+        "parquet_all": lambda: read_runs(parquet_dir).to_pandas(),
+        "parquet_columns": lambda: read_runs(parquet_dir, columns=["title", "companyName", "country"]).to_pandas(),
+        "parquet_filtered": lambda: read_runs(
+            parquet_dir, since="2025-06-15", companies=["Company 1", "Company 5"],
+            filter=ds.field("country") == "Canada",
+        ).to_pandas(),
+    }
+    results = {}
+    for name, read in readers.items():
+        samples = []
+        start = time.perf_counter()
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            frame = read()
+            samples.append(time.perf_counter() - t0)
+        results[name] = summarize(samples, time.perf_counter() - start)
+        results[name]["rows"] = len(frame)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark JSON vs Parquet run exports")
+    parser.add_argument("--runs", type=int, default=30, help="nightly runs to generate")
+    parser.add_argument("--jobs-per-run", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--keep", help="write the generated month here instead of a temp dir")
+    parser.add_argument("--output", help="default bench/results/export-<commit>.json")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    root = args.keep or tempfile.mkdtemp(prefix="export_bench_")
+    result = {"commit": git_commit(), "runs": args.runs, "jobs_per_run": args.jobs_per_run}
+    try:
+        print(f"Writing {args.runs} runs of {args.jobs_per_run} jobs to {root} ...")
+        runs = synthetic_runs(load_manifest(), args.runs, args.jobs_per_run)
+        json_dir, parquet_dir, timings = write_month(runs, root)
+        result["write"] = {name: summarize(samples, sum(samples)) for name, samples in timings.items()}
+        result["size_mb"] = {
+            "json": round(directory_size(json_dir) / 1e6, 2),
+            "parquet": round(directory_size(parquet_dir) / 1e6, 2),
+        }
+        result["read"] = time_reads(json_dir, parquet_dir, args.rounds)
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(f"\nExport benchmark @ {result['commit']} ({args.runs} x {args.jobs_per_run} jobs)")
+    print(f"  size: json {result['size_mb']['json']} MB, parquet {result['size_mb']['parquet']} MB")
+    for name, stats in result["write"].items():
+        print(f"  {name:<17} per run p50 {stats['p50_ms']:>10.2f} ms")
+    for name, stats in result["read"].items():
+        print(f"  {name:<17} p50 {stats['p50_ms']:>10.2f} ms  ({stats['rows']} rows)")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"export-{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nsaved to file: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
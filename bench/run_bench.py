@@ -0,0 +1,294 @@
+"""
+Offline benchmark for the scraping hot paths.
+
+Replays the recorded pages in bench/fixtures from a local HTTP server and
+answers LLM calls with a deterministic mock, so numbers are comparable
+between commits without touching live sites or a paid provider.
+
+    python -m bench.run_bench
+    python -m bench.run_bench --stages date,salary --compare bench/results/main.json
+    python -m bench.run_bench --db --db-rows 5000    # needs BENCH_PG_* env vars
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from bench.server import load_manifest, start_fixture_server
+
+ALL_STAGES = ["date", "salary", "list", "detail", "db"]
+MOCK_PROVIDER = "openai/mock-model"
+MOCK_API_TOKEN = "mock-key"
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples, wall_seconds):
+    """Turn per-call latencies (seconds) into comparable stats"""
+    count = len(samples)
+    return {
+        "calls": count,
+        "wall_s": round(wall_seconds, 4),
+        "throughput_per_s": round(count / wall_seconds, 2) if wall_seconds else 0.0,
+        "mean_ms": round(sum(samples) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3) if count else 0.0,
+    }
+
+
+def time_sync(func, inputs, rounds):
+    # untimed pass first: dateparser's first call loads its language data
+    # and would otherwise be the p95/max of every run
+    for value in inputs:
+        func(value)
+
+    samples = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for value in inputs:
+            t0 = time.perf_counter()
+            func(value)
+            samples.append(time.perf_counter() - t0)
+    return summarize(samples, time.perf_counter() - start)
+
+
+async def time_async(make_call, inputs, rounds, warmup):
+    for value in inputs[:1] * warmup:
+        await make_call(value)
+
+    samples = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for value in inputs:
+            t0 = time.perf_counter()
+            await make_call(value)
+            samples.append(time.perf_counter() - t0)
+    return summarize(samples, time.perf_counter() - start)
+
+
+def bench_date(manifest, args):
+    from utils.date_parser import parse_posted_date
+    return time_sync(parse_posted_date, manifest["posted_dates"], args.cpu_rounds)
+
+
+def bench_salary(manifest, args):
+    from utils.parse_salary import parse_salary_new
+    return time_sync(parse_salary_new, manifest["salaries"], args.cpu_rounds)
+
+
+def bench_list(manifest, args, server):
+    from core.extractor import job_list_extractor
+
+    site = {
+        "url": server.base_url + manifest["list"]["path"],
+        "wait_for": manifest["list"]["wait_for"],
+        "company_name": manifest["company_name"],
+    }
+
+    async def call(value):
+        jobs = await job_list_extractor(
+            url=value, provider=MOCK_PROVIDER, api_token=MOCK_API_TOKEN, base_url=server.llm_base_url
+        )
+        if len(jobs) != len(manifest["list"]["response"]):
+            raise RuntimeError(f"list extractor returned {len(jobs)} jobs")
+
+    return asyncio.run(time_async(call, [site], args.rounds, args.warmup))
+
+
+def bench_detail(manifest, args, server):
+    from core.extractor import job_detail_extractor_from_url
+
+    urls = [server.base_url + detail["path"] for detail in manifest["details"]]
+
+    async def call(value):
+        job = await job_detail_extractor_from_url(
+            url=value, provider=MOCK_PROVIDER, api_token=MOCK_API_TOKEN, base_url=server.llm_base_url
+        )
+        if not job:
+            raise RuntimeError(f"detail extractor returned nothing for {value}")
+
+    return asyncio.run(time_async(call, urls, args.rounds, args.warmup))
+
+
+def build_db_records(manifest, count):
+    records = []
+    details = [detail["response"] for detail in manifest["details"]]
+    posted = datetime(2025, 6, 22).isoformat()
+    for i in range(count):
+        record = dict(details[i % len(details)])
+        record["jobId"] = f"bench_{i}"
+        record["applicationUrl"] = record["applicationUrl"].replace("{base_url}", "http://127.0.0.1")
+        record["companyLogo"] = record["companyLogo"].replace("{base_url}", "http://127.0.0.1")
+        record["postedDate"] = posted
+        records.append(record)
+    return records
+
+
+def use_scratch_database():
+    """
+    Point db.db_connector at the BENCH_PG_* database. Must run before it is imported.
+
+    The benchmarks fill `job` and job_snapshot with fake rows (search_bench
+    drops `job` outright), so never aim these at production.
+    """
+    missing = [name for name in ("BENCH_PG_HOST", "BENCH_PG_DATABASE", "BENCH_PG_USER") if not os.getenv(name)]
+    if missing:
+        raise RuntimeError(f"set {', '.join(missing)} to a scratch Postgres database")
+    os.environ["HOST"] = os.environ["BENCH_PG_HOST"]
+    os.environ["DATABASE"] = os.environ["BENCH_PG_DATABASE"]
+    os.environ["USER"] = os.environ["BENCH_PG_USER"]
+    os.environ["PASSWORD"] = os.getenv("BENCH_PG_PASSWORD", "")
+
+
+def bench_db(manifest, args):
+    use_scratch_database()
+    from db.db_connector import load_json_to_db
+
+    records = build_db_records(manifest, args.db_rows)
+    samples = []
+    start = time.perf_counter()
+    for _ in range(args.db_rounds):
+        t0 = time.perf_counter()
+        loaded = load_json_to_db(records)
+        samples.append(time.perf_counter() - t0)
+        # load_json_to_db reports failures by returning None, not by raising
+        if loaded is None:
+            raise RuntimeError("load_json_to_db failed, see its printed error")
+    stats = summarize(samples, time.perf_counter() - start)
+    stats["rows_per_s"] = round(args.db_rows * len(samples) / stats["wall_s"], 2) if stats["wall_s"] else 0.0
+    return stats
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current, baseline_path, threshold):
+    """Print deltas against a previous result file; return the stages that regressed"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"\nCompared with {baseline.get('commit')} ({baseline_path}):")
+    regressions = []
+    for stage, stats in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or "error" in stats or "error" in before or not before.get("p50_ms"):
+            continue
+        delta = (stats["p50_ms"] - before["p50_ms"]) / before["p50_ms"]
+        flag = ""
+        if delta > threshold:
+            flag = "  <-- regression"
+            regressions.append(stage)
+        print(f"  {stage:<8} p50 {before['p50_ms']:>10.3f} -> {stats['p50_ms']:>10.3f} ms ({delta:+.1%}){flag}")
+    return regressions
+
+
+def print_report(result):
+    print(f"\nBenchmark @ {result['commit']} (python {result['python']})")
+    print(f"  {'stage':<8} {'calls':>6} {'ops/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for stage, stats in result["stages"].items():
+        if "error" in stats:
+            print(f"  {stage:<8} skipped: {stats['error']}")
+            continue
+        print(
+            f"  {stage:<8} {stats['calls']:>6} {stats['throughput_per_s']:>10.2f} "
+            f"{stats['p50_ms']:>10.3f} {stats['p95_ms']:>10.3f} {stats['max_ms']:>10.3f}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark for the scraping hot paths")
+    parser.add_argument("--stages", default="date,salary,list,detail",
+                        help=f"comma separated subset of {','.join(ALL_STAGES)}")
+    parser.add_argument("--db", action="store_true", help="also benchmark load_json_to_db (needs BENCH_PG_* env)")
+    parser.add_argument("--rounds", type=int, default=3, help="rounds over the list/detail fixtures")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed browser calls before measuring")
+    parser.add_argument("--cpu-rounds", type=int, default=200, help="rounds over the date/salary samples")
+    parser.add_argument("--db-rows", type=int, default=1000)
+    parser.add_argument("--db-rounds", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0,
+                        help="artificial delay added to every mock LLM response")
+    parser.add_argument("--output", help="where to write the JSON result (default bench/results/<commit>.json)")
+    parser.add_argument("--compare", help="previous result file to diff against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="p50 slowdown that counts as a regression when comparing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    if args.db and "db" not in stages:
+        stages.append("db")
+    unknown = set(stages) - set(ALL_STAGES)
+    if unknown:
+        raise SystemExit(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    manifest = load_manifest()
+    server = start_fixture_server(llm_latency=args.llm_latency_ms / 1000)
+    result = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "rounds": args.rounds,
+            "warmup": args.warmup,
+            "cpu_rounds": args.cpu_rounds,
+            "db_rows": args.db_rows,
+            "llm_latency_ms": args.llm_latency_ms,
+        },
+        "stages": {},
+    }
+
+    runners = {
+        "date": lambda: bench_date(manifest, args),
+        "salary": lambda: bench_salary(manifest, args),
+        "list": lambda: bench_list(manifest, args, server),
+        "detail": lambda: bench_detail(manifest, args, server),
+        "db": lambda: bench_db(manifest, args),
+    }
+    try:
+        for stage in stages:
+            try:
+                result["stages"][stage] = runners[stage]()
+            except Exception as e:
+                result["stages"][stage] = {"error": f"{type(e).__name__}: {e}"}
+    finally:
+        server.shutdown()
+    result["llm_calls"] = server.llm_calls
+
+    print_report(result)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nsaved to file: {output}")
+
+    if args.compare:
+        regressions = compare(result, args.compare, args.threshold)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
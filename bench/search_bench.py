@@ -0,0 +1,163 @@
+"""
+Search benchmark on a synthetic job table (1M rows by default).
+
+Fills the BENCH_PG_* scratch database with generated rows, applies
+db.migrations and times db.job_search queries with the indexes and
+again with index scans disabled, which is what every query did before.
+
+    python -m bench.search_bench
+    python -m bench.search_bench --rows 200000 --skip-load --output /tmp/search.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from bench.run_bench import RESULTS_DIR, git_commit, summarize, use_scratch_database
+
+SYNTHETIC_ROWS_SQL = """
+INSERT INTO job ("jobId", title, description, country, category, "workSettings", skills, "postedDate", "companyName")
+SELECT
+    'synthetic_' || g,
+    (ARRAY['Senior', 'Junior', 'Lead', 'Principal', 'Associate'])[1 + g % 5] || ' ' ||
+        (ARRAY['Power Platform Developer', 'Dynamics 365 Consultant', 'Power BI Analyst',
+               'D365 Finance Architect', 'CRM Administrator', 'Power Automate Engineer',
+               'Dynamics 365 Sales Lead'])[1 + g % 7],
+    'Synthetic posting ' || md5(g::text) || ' working with ' ||
+        (ARRAY['Dataverse', 'Azure', 'SQL Server', 'JavaScript', 'Power Apps', 'X++', 'Copilot Studio'])[1 + (g / 7) % 7] ||
+        ' on ' || (ARRAY['canvas apps', 'model-driven apps', 'plugins', 'integrations', 'reporting'])[1 + (g / 3) % 5],
+    (ARRAY['United States', 'United Kingdom', 'Canada', 'Germany', 'India', 'Australia', 'Netherlands'])[1 + g % 7],
+    (ARRAY['developer', 'consultant', 'sales', 'administrator', 'architect', 'analytics', 'automation', 'engineer'])[1 + g % 8],
+    (ARRAY['remote', 'onSite', 'hybrid'])[1 + g % 3],
+    ARRAY[
+        (ARRAY['Power Apps', 'Power Automate', 'Dataverse', 'Power BI', 'Azure', 'C#', 'JavaScript', 'X++', 'SQL'])[1 + g % 9],
+        (ARRAY['Power Apps', 'Power Automate', 'Dataverse', 'Power BI', 'Azure', 'C#', 'JavaScript', 'X++', 'SQL'])[1 + (g / 9) % 9]
+    ],
+    now() - (g % 365) * interval '1 day' - (g % 86400) * interval '1 second',
+    'Company ' || (g % 500)
+FROM generate_series(1, %s) AS g
+"""
+
+SCENARIOS = {
+    "text": {"text": "power automate"},
+    "facets": {"category": "developer", "workSettings": "remote", "country": "Canada"},
+    "text+facets": {"text": "dynamics consultant", "country": "United Kingdom"},
+    "skills": {"skills": ["Dataverse", "Power BI"]},
+    "first_page": {},
+}
+
+
+def load_synthetic_table(conn, rows):
+    from db.db_connector import JOB_TABLE_DDL
+    from db.migrations import migrate
+
+    with conn.cursor() as cur:
+        cur.execute("DROP TABLE IF EXISTS job;")
+        # a fresh table needs every migration again, not just the unrecorded ones
+        cur.execute("DROP TABLE IF EXISTS schema_migrations;")
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto;")
+        cur.execute(JOB_TABLE_DDL)
+        started = time.perf_counter()
+        cur.execute(SYNTHETIC_ROWS_SQL, (rows,))
+        inserted = time.perf_counter() - started
+        started = time.perf_counter()
+        migrate(cur)
+        indexed = time.perf_counter() - started
+    conn.commit()
+    return {"insert_s": round(inserted, 2), "migrate_s": round(indexed, 2)}
+
+
+def time_queries(conn, rounds, deep_pages):
+    from db.job_search import facet_counts, search_jobs
+
+    results = {}
+    for name, filters in SCENARIOS.items():
+        samples = []
+        start = time.perf_counter()
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            search_jobs(conn, **filters)
+            samples.append(time.perf_counter() - t0)
+        results[name] = summarize(samples, time.perf_counter() - start)
+
+    # walk deep_pages pages through the keyset cursor, time the last one
+    samples = []
+    start = time.perf_counter()
+    for _ in range(max(1, rounds // 5)):
+        cursor = None
+        for _ in range(deep_pages):
+            t0 = time.perf_counter()
+            _, cursor = search_jobs(conn, text="developer", cursor=cursor)
+            elapsed = time.perf_counter() - t0
+        samples.append(elapsed)
+    results[f"page_{deep_pages}"] = summarize(samples, time.perf_counter() - start)
+
+    samples = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        facet_counts(conn, "country", text="power platform", category="developer")
+        samples.append(time.perf_counter() - t0)
+    results["facet_counts"] = summarize(samples, time.perf_counter() - start)
+    return results
+
+
+def set_index_scans(conn, enabled):
+    value = "on" if enabled else "off"
+    with conn.cursor() as cur:
+        cur.execute(f"SET enable_indexscan = {value}")
+        cur.execute(f"SET enable_bitmapscan = {value}")
+        cur.execute(f"SET enable_indexonlyscan = {value}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark job search on a synthetic table")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--deep-pages", type=int, default=20)
+    parser.add_argument("--skip-load", action="store_true", help="reuse the synthetic table from a previous run")
+    parser.add_argument("--skip-seqscan", action="store_true", help="don't time the index-less baseline")
+    parser.add_argument("--output", help="default bench/results/search-<commit>.json")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    use_scratch_database()
+    from db.db_connector import get_connection
+
+    conn = get_connection()
+    result = {"commit": git_commit(), "rows": args.rows}
+    try:
+        if not args.skip_load:
+            print(f"Loading {args.rows} synthetic rows ...")
+            result["load"] = load_synthetic_table(conn, args.rows)
+            print(f"  insert {result['load']['insert_s']}s, migrate {result['load']['migrate_s']}s")
+
+        set_index_scans(conn, True)
+        result["indexed"] = time_queries(conn, args.rounds, args.deep_pages)
+        if not args.skip_seqscan:
+            set_index_scans(conn, False)
+            result["seqscan"] = time_queries(conn, max(1, args.rounds // 5), args.deep_pages)
+        conn.rollback()
+    finally:
+        conn.close()
+
+    print(f"\nSearch benchmark @ {result['commit']} ({args.rows} rows)")
+    print(f"  {'query':<14} {'indexed p50':>12} {'seqscan p50':>12}")
+    for name, stats in result["indexed"].items():
+        baseline = result.get("seqscan", {}).get(name, {}).get("p50_ms")
+        baseline = f"{baseline:>12.2f}" if baseline is not None else f"{'-':>12}"
+        print(f"  {name:<14} {stats['p50_ms']:>12.2f} {baseline}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"search-{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nsaved to file: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 1x1 transparent PNG so logo requests resolve without a binary fixture file
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+def load_manifest(fixtures_dir=FIXTURES_DIR):
+    with open(os.path.join(fixtures_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _fill_base_url(value, base_url):
+    """Replace the {base_url} placeholder in a recorded LLM response"""
+    if isinstance(value, str):
+        return value.replace("{base_url}", base_url)
+    if isinstance(value, list):
+        return [_fill_base_url(v, base_url) for v in value]
+    if isinstance(value, dict):
+        return {k: _fill_base_url(v, base_url) for k, v in value.items()}
+    return value
+
+
+def _message_text(messages):
+    parts = []
+    for message in messages or []:
+        content = message.get("content")
+        if isinstance(content, list):
+            parts.extend(p.get("text", "") for p in content if isinstance(p, dict))
+        elif content:
+            parts.append(str(content))
+    return "\n".join(parts)
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # keep benchmark output clean
+        pass
+
+    def _send(self, status, body, content_type):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        page = self.server.pages.get(path)
+        if page:
+            with open(os.path.join(self.server.fixtures_dir, page), "rb") as f:
+                return self._send(200, f.read(), "text/html; charset=utf-8")
+        if path.startswith("/static/"):
+            return self._send(200, PIXEL_PNG, "image/png")
+        return self._send(404, "not found", "text/plain")
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        if not path.endswith("/chat/completions"):
+            return self._send(404, "not found", "text/plain")
+
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        prompt = _message_text(request.get("messages"))
+        blocks = self.server.mock_llm_response(prompt)
+
+        if self.server.llm_latency:
+            time.sleep(self.server.llm_latency)
+
+        content = f"<blocks>{json.dumps(blocks, ensure_ascii=False)}</blocks>"
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        response = {
+            "id": f"mock-{self.server.next_call_id()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+        return self._send(200, json.dumps(response, ensure_ascii=False), "application/json")
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    Serves recorded list/detail pages and a deterministic OpenAI-compatible
+    chat completions endpoint on the same local port.
+    """
+    daemon_threads = True
+
+    def __init__(self, port=0, llm_latency=0.0, fixtures_dir=FIXTURES_DIR):
+        super().__init__(("127.0.0.1", port), FixtureHandler)
+        self.fixtures_dir = fixtures_dir
+        self.manifest = load_manifest(fixtures_dir)
+        self.llm_latency = llm_latency
+        self.llm_calls = 0
+        self._lock = threading.Lock()
+
+        self.pages = {self.manifest["list"]["path"]: self.manifest["list"]["page"]}
+        for detail in self.manifest["details"]:
+            self.pages[detail["path"]] = detail["page"]
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def llm_base_url(self):
+        return f"{self.base_url}/v1"
+
+    def next_call_id(self):
+        with self._lock:
+            self.llm_calls += 1
+            return self.llm_calls
+
+    def mock_llm_response(self, prompt):
+        # The list page also contains every job title, so match it first
+        listing = self.manifest["list"]
+        if listing["marker"] in prompt:
+            return _fill_base_url(listing["response"], self.base_url)
+        for detail in self.manifest["details"]:
+            if detail["marker"] in prompt:
+                return [_fill_base_url(detail["response"], self.base_url)]
+        return []
+
+
+def start_fixture_server(port=0, llm_latency=0.0):
+    server = FixtureServer(port=port, llm_latency=llm_latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    server = start_fixture_server(port=8765)
+    print(f"Serving fixtures on {server.base_url} (LLM at {server.llm_base_url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
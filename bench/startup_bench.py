@@ -0,0 +1,98 @@
+"""
+Cold-start benchmark for the CLI.
+
+Every sample is a fresh interpreter. For each subcommand it times the CLI
+itself (`main.py <command> --help`) and importing the modules that command
+pulls in before doing any work; "eager" is everything the old main.py
+imported up front, which every entry point used to pay for.
+
+    python -m bench.startup_bench
+    python -m bench.startup_bench --rounds 10 --compare bench/results/startup-main.json
+
+For a per-module breakdown: python -X importtime main.py load --help
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from bench.run_bench import RESULTS_DIR, git_commit, summarize
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules each subcommand imports before its first real step, keep in sync with main.py
+COMMAND_IMPORTS = {
+    "load": ["core.job_detail_model", "db.db_connector", "db.snapshots", "utils.parquet_export", "utils.reporting"],
+    "retry": ["core.extractor", "core.fetch_policy", "utils.site_registry"],
+    "scrape": ["core.extractor", "core.fetch_policy", "utils.site_registry"],
+    "reindex": ["db.db_connector"],
+    "renormalize": ["db.db_connector", "utils.location"],
+    "reclassify": ["db.db_connector", "utils.classifier"],
+    "eager": [
+        "core.extractor", "db.db_connector", "db.snapshots", "utils.parquet_export", "core.job_detail_model",
+        "core.fetch_policy", "utils.site_registry", "utils.reporting",
+    ],
+}
+
+
+def cases():
+    yield "main --help", [sys.executable, "main.py", "--help"]
+    for command, modules in COMMAND_IMPORTS.items():
+        if command != "eager":
+            yield f"{command} --help", [sys.executable, "main.py", command, "--help"]
+        yield f"{command} imports", [sys.executable, "-c", f"import main, {', '.join(modules)}"]
+
+
+def time_command(argv, rounds):
+    samples = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        completed = subprocess.run(argv, cwd=REPO_ROOT, capture_output=True, text=True)
+        samples.append(time.perf_counter() - t0)
+        if completed.returncode != 0:
+            error = (completed.stderr.strip().splitlines() or ["exit code %d" % completed.returncode])[-1]
+            return {"error": error}
+    return summarize(samples, time.perf_counter() - start)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for main.py subcommands")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="default bench/results/startup-<commit>.json")
+    parser.add_argument("--compare", help="previous startup result file to diff against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = {"commit": git_commit(), "python": sys.version.split()[0], "cases": {}}
+    for name, command in cases():
+        result["cases"][name] = time_command(command, args.rounds)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("cases", {})
+
+    print(f"\nStartup benchmark @ {result['commit']} ({args.rounds} cold starts each)")
+    for name, stats in result["cases"].items():
+        if "error" in stats:
+            print(f"  {name:<18} skipped: {stats['error']}")
+            continue
+        before = baseline.get(name, {}).get("p50_ms")
+        delta = f"  (was {before:.0f} ms)" if before else ""
+        print(f"  {name:<18} p50 {stats['p50_ms']:>8.0f} ms{delta}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"startup-{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nsaved to file: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
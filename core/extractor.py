@@ -1,27 +1,102 @@
   
 import json
+from urllib.parse import urljoin
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, LLMConfig, CacheMode, BrowserConfig
-from crawl4ai.extraction_strategy import LLMExtractionStrategy
+from crawl4ai.async_crawler_strategy import AsyncHTTPCrawlerStrategy
+from crawl4ai.extraction_strategy import LLMExtractionStrategy, JsonCssExtractionStrategy
 from core.job_detail_model import JobData
+from core.fetch_policy import resource_blocker
 from utils.date_parser import parse_posted_date
+from utils.logger import get_logger
 
+logger = get_logger("extractor")
+
+DEFAULT_PAGE_TIMEOUT = 80000
+DEFAULT_DETAIL_WAIT_FOR = "css:h1, p, h5, span"
+
+# fields asked from the LLM on detail pages, cached values are left out per call
+DETAIL_FIELDS = (
+    "jobId", "title", "description", "location", "country", "state", "city", "jobType", "salary",
+    "skills", "experienceLevel", "currency", "applicationUrl", "benefits", "jobStatus",
+    "responsibilities", "workSettings", "roleCategory", "qualifications", "companyLogo",
+    "companyName", "minSalary", "maxSalary", "postedDate", "category",
+)
+# filled in locally (utils.location, utils.classifier, the site registry), never asked from the LLM
+DERIVED_FIELDS = ("country", "state", "city", "classificationConfidence", "siteId", "sourceUrl")
+
+# per-field instruction lines, only sent along with their field
+FIELD_RULES = {
+    "location": 'as written on the page.',
+    "salary": 'If both annual and hourly rates are present, return the annual. If only hourly is provided, return it with its frequency (e.g., "60 - 85 USD per hour"). If no salary is found, return an empty string.',
+    "jobType": 'one of "fullTime", "partTime", "contractToHire", "tempContract", "gigWork".',
+    "experienceLevel": 'one of "beginner", "intermediate", "expert", or "experienced".',
+    "workSettings": 'one of "remote", "onSite", "hybrid".',
+    "category": 'classify based on title/description as "developer", "consultant", "sales", "administrator", "architect", "analytics", "automation", "" or "engineer".',
+    "roleCategory": 'infer based on job title or context.',
+}
+
+DETAIL_INSTRUCTION = """
+    
+        Extract the following job-related fields from the HTML content of the job page and return the result as a Python dictionary with matching keys:
+
+            Fields:
+            {fields}
+
+            Instructions:
+            - Only extract jobs related to Dynamics 365 or Power Platform. If unrelated, return nothing.
+            Return clean, structured values:
+            {rules}
+            
+             Return the result as a single Python dictionary.
+"""
+
+# Clicks a "load more" button up to max_pages times, waiting for results in between
+LOAD_MORE_JS = """
+for (let i = 0; i < %d; i++) {
+    const button = document.querySelector(%s);
+    if (!button) break;
+    button.click();
+    await new Promise(resolve => setTimeout(resolve, 1500));
+}
+"""
+
+
+def _crawler(site):
+    """Build the crawler for the site's fetch tier"""
+    site = site or {}
+    tier = site.get("fetch_tier") or "text"
+    if tier == "http":
+        return AsyncWebCrawler(crawler_strategy=AsyncHTTPCrawlerStrategy())
+    crawler = AsyncWebCrawler(config=BrowserConfig(headless=True, text_mode=(tier == "text")))
+    if site.get("block_resources", True):
+        crawler.crawler_strategy.set_hook("on_page_context_created", resource_blocker(keep_images=(tier == "full")))
+    return crawler
+
+
+def _pagination_args(site):
+    strategy = site.get("pagination") or "none"
+    if strategy == "scroll":
+        return {"scan_full_page": True}
+    if strategy == "load_more" and site.get("load_more_selector"):
+        js = LOAD_MORE_JS % (int(site.get("max_pages") or 1), json.dumps(site["load_more_selector"]))
+        return {"js_code": [js]}
+    return {}
 
 
 # ------ Job extractor --- 
 
-async def job_list_extractor(url: dict, provider: str, api_token: str = None, extra_headers: dict = None):
-    browser_config = BrowserConfig(headless=True,text_mode=True )
+async def job_list_extractor(url: dict, provider: str, api_token: str = None, extra_headers: dict = None, base_url: str = None):
+    """`url` is a site profile from utils.site_registry (or any dict with url/wait_for)"""
     extra_args = {"temperature": 0, "top_p": 0.9, "max_tokens": 2000}
     if extra_headers:
         extra_args["extra_headers"] = extra_headers
 
-    crawler_config = CrawlerRunConfig(
-        cache_mode=CacheMode.BYPASS,
-        word_count_threshold=1,
-        page_timeout=80000,
-        wait_for=url.get("wait_for") or "css:div",
-        extraction_strategy=LLMExtractionStrategy(
-            llm_config=LLMConfig(provider=provider, api_token=api_token),
+    use_css = url.get("extraction_tier") == "css" and bool(url.get("selectors"))
+    if use_css:
+        extraction_strategy = JsonCssExtractionStrategy(url["selectors"])
+    else:
+        extraction_strategy = LLMExtractionStrategy(
+            llm_config=LLMConfig(provider=provider, api_token=api_token, base_url=base_url),
             schema=JobData.model_json_schema(),
             extraction_type="schema",
             instruction="""
@@ -31,38 +106,47 @@ async def job_list_extractor(url: dict, provider: str, api_token: str = None, ex
             Return result as a Python dictionary with matching keys. Use empty string or default if not found.
             """,
             extra_args=extra_args,
-        ),
+        )
+
+    crawler_config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        word_count_threshold=1,
+        page_timeout=url.get("page_timeout") or DEFAULT_PAGE_TIMEOUT,
+        wait_for=url.get("wait_for") or "css:div",
+        extraction_strategy=extraction_strategy,
+        **_pagination_args(url),
     )
 
-    async with AsyncWebCrawler(config=browser_config) as crawler:
+    async with _crawler(url) as crawler:
         result = await crawler.arun(url=url["url"], config=crawler_config)
-        jobs=[]
-        content = result.extracted_content
-        if isinstance(content, str):
-            try:
-                content= json.loads(result.extracted_content)
-                # print("str.....")
-            except Exception:
-                content = []
-                
-        if isinstance(content, list):
-            print(f" ✓✅ found {len(content)} number of jobs")
-            for job in content:
-                
-                raw_date = job.get('postedDate', '')
-                job['postedDate'] = parse_posted_date(raw_date)
-                jobs.append(job)
-        else:
-            raw_date = content.get('postedDate', '')
-            content['postedDate'] = parse_posted_date(raw_date)
-            jobs = [content]
-        return jobs
+        jobs = JobData.from_llm(result.extracted_content)
+
+    if use_css and not jobs:
+        # selectors went stale, let the LLM have a go
+        logger.warning("CSS selectors found nothing, falling back to LLM")
+        return await job_list_extractor({**url, "extraction_tier": "llm"}, provider, api_token, extra_headers, base_url)
+
+    logger.info("Found %d jobs on the list page", len(jobs))
+    for job in jobs:
+        job.postedDate = parse_posted_date(job.postedDate)
+        if job.applicationUrl:
+            job.applicationUrl = urljoin(url["url"], job.applicationUrl)
+    return jobs
         
        
  
 # --- Extract Structured Data from a URL ---
-async def job_detail_extractor_from_url(url:str, provider: str, api_token: str = None, extra_headers: dict = None):
-    browser_config = BrowserConfig(headless=True,text_mode=True )
+async def job_detail_extractor_from_url(url:str, provider: str, api_token: str = None, extra_headers: dict = None, base_url: str = None, site: dict = None, skip_fields=()):
+    """skip_fields: fields already known for this job (a cached companyLogo, a confident classification), not asked from the LLM"""
+    site = site or {}
+    skip_fields = (*DERIVED_FIELDS, *skip_fields)
+    fields = "\n            ".join(f"- {name}" for name in DETAIL_FIELDS if name not in skip_fields)
+    rules = "\n            ".join(
+        f"- {name}: {rule}" for name, rule in FIELD_RULES.items() if name not in skip_fields
+    )
+    schema = JobData.model_json_schema()
+    for name in skip_fields:
+        schema["properties"].pop(name, None)
     extra_args = {"temperature": 0, "top_p": 0.9, "max_tokens": 2000}
     if extra_headers:
         extra_args["extra_headers"] = extra_headers
@@ -70,107 +154,29 @@ async def job_detail_extractor_from_url(url:str, provider: str, api_token: str =
     crawler_config = CrawlerRunConfig(
         cache_mode=CacheMode.BYPASS,
         word_count_threshold=1,
-        page_timeout=80000,
+        page_timeout=site.get("detail_timeout") or DEFAULT_PAGE_TIMEOUT,
         # wait_for="css:h1",
-        wait_for = "css:h1, p, h5, span",
+        wait_for = site.get("detail_wait_for") or DEFAULT_DETAIL_WAIT_FOR,
         extraction_strategy=LLMExtractionStrategy(
-            llm_config=LLMConfig(provider=provider, api_token=api_token),
-            schema=JobData.model_json_schema(),
+            llm_config=LLMConfig(provider=provider, api_token=api_token, base_url=base_url),
+            schema=schema,
             extraction_type="schema",
-            instruction="""
-    
-        Extract the following job-related fields from the HTML content of the job page and return the result as a Python dictionary with matching keys:
-
-            Fields:
-            - jobId
-            - title
-            - description
-            - location
-            - country
-            - state
-            - city
-            - jobType
-            - salary
-            - skills
-            - experienceLevel
-            - currency
-            - applicationUrl
-            - benefits
-            - jobStatus
-            - responsibilities
-            - workSettings
-            - roleCategory
-            - qualifications
-            - companyLogo
-            - companyName
-            - minSalary
-            - maxSalary
-            - postedDate
-            - category
-
-            Instructions:
-            - Only extract jobs related to Dynamics 365 or Power Platform. If unrelated, return nothing.
-            - Use full names for location abbreviations (e.g., "US" → "United States", "NJ" → "New Jersey").
-            Return clean, structured values:
-            - location, country, state, city: must contain only names, no additional text.
-            - salary: If both annual and hourly rates are present, return the annual. If only hourly is provided, return it with its frequency (e.g., "60 - 85 USD per hour"). If no salary is found, return an empty string.
-            - jobType: one of "fullTime", "partTime", "contractToHire", "tempContract", "gigWork".
-            - experienceLevel: one of "beginner", "intermediate", "expert", or "experienced".
-            - workSettings: one of "remote", "onSite", "hybrid".
-            - category: classify based on title/description as "developer", "consultant", "sales", "administrator", "architect", "analytics", "automation", "" or "engineer".
-            - roleCategory: infer based on job title or context.
-            
-             Return the result as a single Python dictionary.
-            """,
+            instruction=DETAIL_INSTRUCTION.format(fields=fields, rules=rules),
             extra_args=extra_args,
         ),
     )
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        
+    async with _crawler(site) as crawler:
         try: 
             result = await crawler.arun(url=url, config=crawler_config)
-            content = result.extracted_content
-        
-            last_job={}
-
-            # Attempt to parse string to JSON
-            if isinstance(content, str):
-                try:
-                    # json string
-                    parsed = json.loads(content)
-                    if isinstance(parsed, str):
-                        parsed = json.loads(parsed)
-                    content=parsed
-                    print("✓✅ JSON string parsed.")
-                    # print("dictionary", job_dic)
-                except Exception as e:
-                    print("Failed to parse JSON string.", e)
-                    return {}
-                
-                
-            # If content is a list of jobs
-                if isinstance(content, list):
-                
-                    print(f"✓✅ Found {len(content)} job(s)")
-                    last_job=content[-1]
-                    raw_date = last_job.get('postedDate', '')
-                    last_job['postedDate'] = parse_posted_date(raw_date)
-                    print("✓✅ Extracted job:")
-                    return last_job
-
-                # If content is a single job dictionary
-                elif isinstance(content, dict):
-                    raw_date = content.get('postedDate', '')
-                    content['postedDate'] = parse_posted_date(raw_date)
-                    #   content
-                    # print("✓✅ Single job (dict):")
-                    return content
-                    
-                else:
-                    # print(f"⚠️ Unexpected parsed content type: {type(content)}")
-                    return {}    
-        except Exception as e:
-            return {}    
+            jobs = JobData.from_llm(result.extracted_content)
+            if not jobs:
+                return None
 
-    
-   
\ No newline at end of file
+            # the page sometimes yields several blocks, the last one is the job itself
+            job = jobs[-1]
+            job.postedDate = parse_posted_date(job.postedDate)
+            logger.info("Extracted job detail", extra={"sample": True})
+            return job
+        except Exception as e:
+            logger.warning("Failed to extract job detail: %s", e)
+            return None
@@ -0,0 +1,121 @@
+import asyncio
+
+from utils.site_registry import domain_latency_samples
+
+# Adaptive timeouts kick in once a domain has this many observed loads
+MIN_SAMPLES = 5
+# timeout = p95 * multiplier, bounded by MIN_TIMEOUT_MS and the configured timeout
+TIMEOUT_MULTIPLIER = 3
+MIN_TIMEOUT_MS = 10000
+# a second attempt is started once the first runs past this percentile
+HEDGE_PERCENTILE = 90
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+ANALYTICS_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "connect.facebook.com", "hotjar.com", "segment.io", "segment.com",
+    "clarity.ms", "bat.bing.com", "linkedin.com/li/track", "snap.licdn.com", "adsrvr.org",
+    "newrelic.com", "nr-data.net", "optimizely.com", "mixpanel.com", "heapanalytics.com",
+)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def adaptive_timeout(samples_ms, configured_ms):
+    """Scale the timeout to what the domain actually needs, never above the configured one"""
+    if len(samples_ms) < MIN_SAMPLES:
+        return configured_ms
+    learned = max(MIN_TIMEOUT_MS, percentile(samples_ms, 95) * TIMEOUT_MULTIPLIER)
+    return int(min(configured_ms, learned))
+
+
+def hedge_delay(samples_ms):
+    """Seconds to wait before hedging a detail fetch, or None without enough history"""
+    if len(samples_ms) < MIN_SAMPLES:
+        return None
+    return percentile(samples_ms, HEDGE_PERCENTILE) / 1000
+
+
+def apply_fetch_policy(site, stats):
+    """
+    Return a copy of the site profile with timeouts derived from the
+    latency history of its domain, plus the hedge delay for detail pages.
+    """
+    site = dict(site)
+    domain = site.get("domain")
+    list_samples = domain_latency_samples(stats, domain, "list")
+    detail_samples = domain_latency_samples(stats, domain, "detail")
+    site["page_timeout"] = adaptive_timeout(list_samples, site["page_timeout"])
+    site["detail_timeout"] = adaptive_timeout(detail_samples, site["detail_timeout"])
+    site["hedge_after"] = hedge_delay(detail_samples) if site.get("hedge") else None
+    return site
+
+
+async def hedged(make_call, hedge_after, limit=None):
+    """
+    Await make_call(); if it is still running after hedge_after seconds,
+    start a second attempt and return whichever yields a result first.
+
+    limit: the site's concurrency semaphore, held by the caller for the first
+    attempt. The second one only starts if a slot is free right then, never
+    queues for one: the slot it would wait on may be this caller's own.
+    """
+    if not hedge_after:
+        return await make_call()
+
+    first = asyncio.ensure_future(make_call())
+    pending = {first}
+    error = None
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return first.result()
+
+        if limit is not None:
+            if limit.locked():
+                return await first
+            # free, so this takes the slot without suspending
+            await limit.acquire()
+        second = asyncio.ensure_future(make_call())
+        if limit is not None:
+            second.add_done_callback(lambda _: limit.release())
+        pending.add(second)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                elif task.result() is not None:
+                    return task.result()
+        if error:
+            raise error
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _is_heavy(request, keep_images):
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return not (keep_images and request.resource_type == "image")
+    return any(host in request.url for host in ANALYTICS_HOSTS)
+
+
+def resource_blocker(keep_images=False):
+    """crawl4ai on_page_context_created hook that aborts images, media, fonts and analytics"""
+    async def handle(route):
+        if _is_heavy(route.request, keep_images):
+            await route.abort()
+        else:
+            # let crawl4ai's own context routes see the request
+            await route.fallback()
+
+    async def hook(page, context=None, **kwargs):
+        await page.route("**/*", handle)
+        return page
+
+    return hook
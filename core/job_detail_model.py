@@ -1,8 +1,31 @@
-from pydantic import BaseModel
+import ast
+import json
+import re
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
 from typing import Optional
 
+from utils.logger import get_logger
+
+logger = get_logger("model")
+
+LIST_FIELDS = ("skills", "benefits", "responsibilities", "qualifications")
+# amounts as written by the LLM: "90k", "1.2M", "$120,000"
+AMOUNT_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([kKmM](?![a-zA-Z]))?")
+AMOUNT_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+# minSalary/maxSalary are INTEGER in Postgres, one bigger value would fail the whole load
+MAX_AMOUNT = 2**31 - 1
+STR_FIELDS = (
+    "jobId", "title", "description", "location", "country", "state", "city", "jobType",
+    "salary", "experienceLevel", "currency", "applicationUrl", "approvalStatus", "jobStatus",
+    "workSettings", "roleCategory", "companyLogo", "companyName", "category", "siteId", "sourceUrl",
+)
+
 
 class JobData(BaseModel):
+    # crawl4ai adds bookkeeping keys such as "error" to every block
+    model_config = ConfigDict(extra="ignore")
+
     jobId: str = ""
     title: str = ""
     description: str = ""
@@ -30,4 +53,113 @@ class JobData(BaseModel):
     minSalary: float = 0.0
     maxSalary: float = 0.0
     postedDate: Optional[str] = ""
-    category:str=""
\ No newline at end of file
+    category:str=""
+    # lowest utils.classifier confidence of jobType/workSettings/experienceLevel/category
+    classificationConfidence: float = 0.0
+    # registry site the posting was listed on and the detail URL listed there,
+    # what db.snapshots closes missing postings by
+    siteId: str = ""
+    sourceUrl: str = ""
+
+    @field_validator(*STR_FIELDS, mode="before")
+    @classmethod
+    def _coerce_str(cls, value):
+        if value is None:
+            return ""
+        if isinstance(value, (list, tuple)):
+            return ", ".join(str(v) for v in value if v not in (None, ""))
+        if isinstance(value, str):
+            return value.strip()
+        return str(value)
+
+    @field_validator(*LIST_FIELDS, mode="before")
+    @classmethod
+    def _coerce_list(cls, value):
+        """Accept real lists, JSON / Python list literals and plain strings"""
+        if value is None:
+            return []
+        if isinstance(value, str):
+            text = value.strip()
+            if not text:
+                return []
+            if text.startswith("["):
+                try:
+                    value = json.loads(text)
+                except ValueError:
+                    try:
+                        value = ast.literal_eval(text)
+                    except (ValueError, SyntaxError):
+                        return [text]
+            else:
+                return [text]
+        if isinstance(value, (list, tuple)):
+            return [str(v).strip() for v in value if v not in (None, "") and str(v).strip()]
+        return [str(value)]
+
+    @field_validator("minSalary", "maxSalary", "classificationConfidence", mode="before")
+    @classmethod
+    def _coerce_amount(cls, value):
+        """"90k" -> 90000.0, "1.2M" -> 1200000.0; anything the INTEGER columns can't hold -> 0.0"""
+        if value is None or value == "":
+            return 0.0
+        if isinstance(value, str):
+            match = AMOUNT_PATTERN.search(value.replace(",", ""))
+            if not match:
+                return 0.0
+            value = float(match.group(1)) * AMOUNT_SUFFIXES.get((match.group(2) or "").lower(), 1)
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return 0.0
+        return value if 0 <= value <= MAX_AMOUNT else 0.0
+
+    @field_validator("brokenLink", "ipBlocked", mode="before")
+    @classmethod
+    def _coerce_flag(cls, value):
+        return False if value in (None, "") else value
+
+    @field_validator("postedDate", mode="before")
+    @classmethod
+    def _coerce_date(cls, value):
+        if value is None:
+            return ""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return str(value).strip()
+
+    @classmethod
+    def from_llm(cls, content):
+        """
+        Validate raw LLM extraction output into JobData records.
+
+        Handles JSON strings (including double-encoded ones), a single dict or
+        a list of blocks, and skips crawl4ai error blocks. Returns a list.
+        """
+        if isinstance(content, str):
+            try:
+                content = json.loads(content)
+                if isinstance(content, str):
+                    content = json.loads(content)
+            except ValueError as e:
+                logger.warning("Failed to parse LLM output as JSON: %s", e)
+                return []
+
+        if isinstance(content, dict):
+            content = [content]
+        if not isinstance(content, list):
+            return []
+
+        jobs = []
+        for block in content:
+            if not isinstance(block, dict) or block.get("error") is True:
+                continue
+            try:
+                jobs.append(cls.model_validate(block))
+            except ValidationError as e:
+                logger.warning("Dropping malformed job block: %s", e)
+        return jobs
+
+
+def to_jobs(items):
+    """Coerce dicts (e.g. reloaded JSON) into JobData, leaving JobData untouched"""
+    return [item if isinstance(item, JobData) else JobData.model_validate(item) for item in items]
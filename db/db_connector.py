@@ -1,11 +1,13 @@
 
 import psycopg2
-import pandas as pd
 import os
 import json
-import ast  # For safely evaluating strings containing Python literals
+from datetime import datetime
 from dotenv import load_dotenv
 from psycopg2.extras import execute_values
+from core.job_detail_model import to_jobs
+from db.migrations import migrate
+from db.snapshots import new_run_id, write_snapshot, refresh_current_jobs
 
 load_dotenv()
 DATABASE = os.getenv("DATABASE")
@@ -14,65 +16,108 @@ HOST = os.getenv("HOST")
 PASSWORD = os.getenv("PASSWORD")
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-def clean_array_string(array_str):
-    """Convert string representation of array to actual list"""
-    try:
-        if isinstance(array_str, str):
-            return ast.literal_eval(array_str)
-        return array_str or []
-    except (ValueError, SyntaxError):
-        return []
-
-def load_json_to_db(json_file):
-    """Loads job data from JSON into PostgreSQL database"""
+JOB_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS job (
+    "id" UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    "jobId" TEXT DEFAULT '',
+    "title" TEXT DEFAULT '',
+    "description" TEXT DEFAULT '',
+    "location" TEXT DEFAULT '',
+    "country" TEXT DEFAULT '',
+    "state" TEXT DEFAULT '',
+    "city" TEXT DEFAULT '',
+    "jobType" TEXT DEFAULT 'fullTime',
+    "salary" TEXT DEFAULT '',
+    "skills" TEXT[] DEFAULT '{}',
+    "experienceLevel" TEXT DEFAULT 'experienced',
+    "currency" TEXT DEFAULT '',
+    "applicationUrl" TEXT DEFAULT '',
+    "benefits" TEXT[] DEFAULT '{}',
+    "approvalStatus" TEXT,
+    "brokenLink" BOOLEAN DEFAULT FALSE,
+    "jobStatus" TEXT DEFAULT 'active',
+    "responsibilities" TEXT[] DEFAULT '{}',
+    "workSettings" TEXT,
+    "roleCategory" TEXT DEFAULT '',
+    "qualifications" TEXT[] DEFAULT '{}',
+    "companyLogo" TEXT DEFAULT '',
+    "companyName" TEXT ,
+    "ipBlocked" BOOLEAN DEFAULT FALSE,
+    "createdAt" TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    "minSalary" INTEGER DEFAULT 0,
+    "maxSalary" INTEGER DEFAULT 0,
+    "postedDate" TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    "category" TEXT
+)
+"""
+
+# Column order of the batch insert; job_row must follow it
+JOB_INSERT_COLUMNS = (
+    '"companyName"', '"companyLogo"', '"jobId"', 'title', 'location', 'salary',
+    'description', '"roleCategory"', 'responsibilities', 'skills', '"applicationUrl"',
+    'country', 'state', 'city', 'currency', '"minSalary"', '"maxSalary"',
+    'qualifications', '"experienceLevel"', 'benefits', '"workSettings"', '"postedDate"', 'category',
+    '"jobType"', '"classificationConfidence"', '"siteId"', '"sourceUrl"',
+)
+
+def job_row(job):
+    """Adapt a JobData record to an insert tuple; lists go straight to TEXT[]"""
+    return (
+        job.companyName,
+        job.companyLogo,
+        job.jobId,
+        job.title,
+        job.location,
+        job.salary,
+        job.description,
+        job.roleCategory,
+        job.responsibilities,
+        job.skills,
+        job.applicationUrl,
+        job.country,
+        job.state,
+        job.city,
+        job.currency,
+        int(job.minSalary),
+        int(job.maxSalary),
+        job.qualifications,
+        job.experienceLevel,
+        job.benefits,
+        job.workSettings,
+        # keep rows orderable for keyset search, same as the column default
+        job.postedDate or datetime.now().isoformat(),
+        job.category,
+        job.jobType or "fullTime",
+        job.classificationConfidence,
+        job.siteId,
+        job.sourceUrl,
+    )
+
+def get_connection():
+    return psycopg2.connect(
+        host=HOST,
+        database=DATABASE,
+        user=USER,
+        password=PASSWORD
+    )
+
+def load_json_to_db(json_file, run_id=None, site_runs=None):
+    """
+    Loads job data from JSON into PostgreSQL database.
+
+    The run is appended to job_snapshot and `job` is updated from it in
+    place (see db.snapshots), all in one transaction. site_runs lists the
+    sites whose list pages were scraped, whose missing postings are closed.
+    """
     
     try:
         # Connect to PostgreSQL
-        conn = psycopg2.connect(
-            host=HOST,
-            database=DATABASE,
-            user=USER,
-            password=PASSWORD
-        )
+        conn = get_connection()
         cursor = conn.cursor()
-        cursor.execute("DROP TABLE IF EXISTS job;")
         cursor.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto;")
-#
-        cursor.execute("""  
-        CREATE TABLE IF NOT EXISTS job (  
-            "id" UUID DEFAULT gen_random_uuid() PRIMARY KEY,  
-            "jobId" TEXT DEFAULT '',  
-            "title" TEXT DEFAULT '',  
-            "description" TEXT DEFAULT '',  
-            "location" TEXT DEFAULT '',  
-            "country" TEXT DEFAULT '',  
-            "state" TEXT DEFAULT '',  
-            "city" TEXT DEFAULT '',  
-            "jobType" TEXT DEFAULT 'fullTime',  
-            "salary" TEXT DEFAULT '',  
-            "skills" TEXT[] DEFAULT '{}',  
-            "experienceLevel" TEXT DEFAULT 'experienced',  
-            "currency" TEXT DEFAULT '',
-            "applicationUrl" TEXT DEFAULT '',  
-            "benefits" TEXT[] DEFAULT '{}',  
-            "approvalStatus" TEXT,  
-            "brokenLink" BOOLEAN DEFAULT FALSE,  
-            "jobStatus" TEXT DEFAULT 'active', 
-            "responsibilities" TEXT[] DEFAULT '{}',  
-            "workSettings" TEXT,  
-            "roleCategory" TEXT DEFAULT '',  
-            "qualifications" TEXT[] DEFAULT '{}',  
-            "companyLogo" TEXT DEFAULT '',  
-            "companyName" TEXT ,
-            "ipBlocked" BOOLEAN DEFAULT FALSE,  
-            "createdAt" TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  
-            "updatedAt" TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            "minSalary" INTEGER DEFAULT 0,
-            "maxSalary" INTEGER DEFAULT 0,
-            "postedDate" TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            "category" TEXT
-        )  
-        """)
+        cursor.execute(JOB_TABLE_DDL)
+        migrate(cursor)
 
         
         if isinstance(json_file, str):
@@ -83,67 +128,25 @@ def load_json_to_db(json_file):
                 # Try with different encoding if UTF-8 fails
                 with open(json_file, 'r', encoding='utf-8-sig') as f:
                     data = json.load(f)
-            df = pd.DataFrame(data)
-            print("len of job",len(df))
+            jobs = to_jobs(data)
+            print("len of job",len(jobs))
         else:
-            df = pd.DataFrame(json_file)
-            print("len of job direct access",len(df))
-            
-            # Drop rows where title is null or empty
-        df = df[df['title'].notna() & (df['title'].astype(str).str.strip() != '')]
-        print("len after dropping empty titles:", len(df))
-        # Prepare rows for insertion
-        rows = []
-        for _, row in df.iterrows():
+            jobs = to_jobs(json_file)
+            print("len of job direct access",len(jobs))
             
-            max_salary = row.get('maxSalary', 0)
-            min_salary = row.get('minSalary', 0)
-            max_salary = 0 if pd.isna(max_salary) else int(max_salary)
-            min_salary = 0 if pd.isna(min_salary) else int(min_salary)
-            rows.append((
-                row.get('companyName', ''),  # Default to 'Nigel Frank' if not provided
-                row.get('companyLogo', ''),
-                row.get('jobId', ''),  
-                row.get('title', ''), 
-                row.get('location', ''), 
-                row.get('salary', ''),
-                row.get('description', ''), 
-                row.get("roleCategory",""),
-                clean_array_string(row.get('responsibilities')),  # Convert to proper array
-                clean_array_string(row.get('skills')),           # Convert to proper array
-                row.get('applicationUrl', ''), 
-                row.get('country', ''), 
-                row.get('state', ''), 
-                row.get('city', ''),
-                row.get('currency', ''),
-                max_salary,
-               
-                min_salary,
-                clean_array_string(row.get('qualifications')),# Ensure integer type
-                row.get("experienceLevel",""),
-                clean_array_string(row.get('benefits', [])),  # Convert to proper array
-                row.get("workSettings",""),
-                row.get("postedDate"),
-                row.get("category","")
-                
-                
-            ))
-
-
-        # Batch insert
-        insert_query = """
-            INSERT INTO job (
-                "companyName","companyLogo",
-                "jobId", title, location, salary, 
-                description, "roleCategory", responsibilities, skills,   
-                "applicationUrl", country, state, city, currency, "minSalary", "maxSalary", qualifications,"experienceLevel", benefits,  "workSettings", "postedDate",category
-            ) VALUES %s
-        """
-        execute_values(cursor, insert_query, rows)
+        # Drop rows where title is empty
+        jobs = [job for job in jobs if job.title.strip()]
+        print("len after dropping empty titles:", len(jobs))
+        rows = [job_row(job) for job in jobs]
+
+        snapshot_at = datetime.now()
+        run_id = run_id or new_run_id(snapshot_at)
+        write_snapshot(cursor, run_id, snapshot_at, JOB_INSERT_COLUMNS, rows)
+        changed, closed = refresh_current_jobs(cursor, run_id, snapshot_at, site_runs)
 
         conn.commit()
         print(f"Successfully inserted {len(rows)} records")
-        return f"Successfully inserted {len(rows)} records"
+        return f"Successfully inserted {len(rows)} records (run {run_id}: {changed} new or changed, {closed} closed)"
     except Exception as e:
         print(f"Error: {e}")
         
@@ -153,6 +156,155 @@ def load_json_to_db(json_file):
         cursor.close()
         conn.close()
 
+def reindex_jobs(rebuild=False):
+    """
+    Apply pending migrations and refresh planner statistics without loading data.
+
+    rebuild=True also runs REINDEX TABLE CONCURRENTLY on job, which can't run
+    inside a transaction, so it happens after the migrations are committed.
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto;")
+            cursor.execute(JOB_TABLE_DDL)
+            applied = migrate(cursor)
+            cursor.execute("ANALYZE job")
+        conn.commit()
+        if rebuild:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute("REINDEX TABLE CONCURRENTLY job")
+        return f"Applied {applied} migrations" + (", rebuilt job indexes" if rebuild else "")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def renormalize_job_locations(batch_size=1000):
+    """
+    Re-run the gazetteer normalizer (utils.location) over the stored jobs.
+
+    Rows are streamed through a server-side cursor and only the ones whose
+    city, state or country change are updated, batch_size at a time;
+    `location` keeps the page's text.
+    """
+    from utils.location import normalize_location
+
+    conn = get_connection()
+    try:
+        changed = scanned = 0
+        with conn.cursor(name="renormalize_jobs") as reader, conn.cursor() as writer:
+            reader.itersize = batch_size
+            reader.execute("SELECT id::text, location, city, state, country FROM job")
+            updates = []
+            for job_id, location, city, state, country in reader:
+                scanned += 1
+                current = (city or "", state or "", country or "")
+                text = location or ", ".join(value for value in current if value)
+                result = normalize_location(text)
+                if not result.country:
+                    continue
+                row = tuple(new or old for new, old in zip(result[1:], current))
+                if row != current:
+                    updates.append((job_id, *row))
+                if len(updates) >= batch_size:
+                    changed += _update_locations(writer, updates)
+                    updates = []
+            if updates:
+                changed += _update_locations(writer, updates)
+        conn.commit()
+        return f"Renormalized {changed} of {scanned} job locations"
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def _update_locations(cursor, rows):
+    execute_values(cursor, """
+        UPDATE job SET city = v.city, state = v.state, country = v.country
+        FROM (VALUES %s) AS v(id, city, state, country)
+        WHERE job.id = v.id::uuid
+    """, rows, page_size=len(rows))
+    return len(rows)
+
+def train_job_classifier():
+    """Fit the optional utils.classifier model on the labels already stored in job"""
+    from utils.classifier import LABELS, train_model
+
+    columns = ", ".join(f'"{field}"' for field in LABELS)
+    conn = get_connection()
+    try:
+        with conn.cursor(name="classifier_training") as cursor:
+            cursor.execute(f"SELECT title, description, {columns} FROM job")
+            rows = [(title, description, dict(zip(LABELS, labels))) for title, description, *labels in cursor]
+        trained = train_model(rows)
+        return "Trained classifier on " + ", ".join(f"{field} ({count} rows)" for field, count in trained.items())
+    finally:
+        conn.close()
+
+def reclassify_jobs(batch_size=1000, threshold=None):
+    """
+    Re-run utils.classifier over the stored jobs.
+
+    Confident predictions replace the stored labels, the rest keep what the
+    LLM said; every row gets its classificationConfidence. Only rows that
+    change are updated, batch_size at a time.
+    """
+    from utils.classifier import CONFIDENCE_THRESHOLD, LABELS, classify
+
+    threshold = CONFIDENCE_THRESHOLD if threshold is None else threshold
+    columns = [f'"{field}"' for field in LABELS]
+    conn = get_connection()
+    try:
+        # classificationConfidence comes with migration 6
+        with conn.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto;")
+            cursor.execute(JOB_TABLE_DDL)
+            migrate(cursor)
+        conn.commit()
+        changed = scanned = 0
+        with conn.cursor(name="reclassify_jobs") as reader, conn.cursor() as writer:
+            reader.itersize = batch_size
+            reader.execute(f'SELECT id::text, title, description, {", ".join(columns)}, "classificationConfidence" FROM job')
+            updates = []
+            for job_id, title, description, *stored, confidence in reader:
+                scanned += 1
+                predictions = classify(title or "", description or "")
+                labels = []
+                for field, value in zip(LABELS, stored):
+                    prediction = predictions[field]
+                    # same rule as classify_job: a valid stored label stands unless the classifier is sure
+                    keep = value and value in LABELS[field] and prediction.confidence < threshold
+                    labels.append(value if keep else prediction.label)
+                row = (*labels, min(prediction.confidence for prediction in predictions.values()))
+                # REAL comes back as float4, compare at the precision the classifier rounds to
+                if row != (*stored, round(confidence or 0, 3)):
+                    updates.append((job_id, *row))
+                if len(updates) >= batch_size:
+                    changed += _update_classification(writer, columns, updates)
+                    updates = []
+            if updates:
+                changed += _update_classification(writer, columns, updates)
+        conn.commit()
+        return f"Reclassified {changed} of {scanned} jobs"
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def _update_classification(cursor, columns, rows):
+    assignments = ", ".join(f"{column} = v.{column}" for column in columns)
+    execute_values(cursor, f"""
+        UPDATE job SET {assignments}, "classificationConfidence" = v."classificationConfidence"
+        FROM (VALUES %s) AS v(id, {", ".join(columns)}, "classificationConfidence")
+        WHERE job.id = v.id::uuid
+    """, rows, page_size=len(rows))
+    return len(rows)
+
 def delete_job_by_id(job_id, host, database, user, password):
     try:
         conn = psycopg2.connect(
@@ -236,6 +388,9 @@ def find_special_salary_rows():
 
 
 def update_salary_from_json(json_file, host, database, user, password):
+    # one-off maintenance, keep pandas out of every other import of this module
+    import pandas as pd
+
     # Load JSON file into DataFrame
     with open(json_file, "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -0,0 +1,104 @@
+"""
+Paginated search over the job table.
+
+Uses the indexes from db.migrations: full-text over title/skills/description
+via "searchVector", GIN on skills, btree on the facets and keyset pagination
+on ("postedDate", id) so deep pages cost the same as the first one.
+"""
+import base64
+import json
+
+SEARCH_COLUMNS = (
+    "id", '"jobId"', "title", '"companyName"', "location", "country", "category",
+    '"workSettings"', "skills", "salary", '"applicationUrl"', '"postedDate"',
+)
+
+# API name -> column
+FACETS = {
+    "category": "category",
+    "workSettings": '"workSettings"',
+    "country": "country",
+}
+
+
+def encode_cursor(row):
+    """Opaque page token from the last row of a page"""
+    raw = json.dumps([row["postedDate"].isoformat(), str(row["id"])])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token):
+    posted_date, job_id = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    return posted_date, job_id
+
+
+def _filters(text=None, skills=None, posted_after=None, **facets):
+    clauses = ['"postedDate" IS NOT NULL']
+    params = []
+    if text:
+        clauses.append("\"searchVector\" @@ websearch_to_tsquery('english', %s)")
+        params.append(text)
+    if skills:
+        clauses.append("skills @> %s::text[]")
+        params.append(list(skills))
+    if posted_after:
+        clauses.append('"postedDate" >= %s')
+        params.append(posted_after)
+    for name, value in facets.items():
+        if name not in FACETS:
+            raise ValueError(f"unknown facet {name!r}")
+        if value:
+            clauses.append(f"{FACETS[name]} = %s")
+            params.append(value)
+    return clauses, params
+
+
+def _rows(cursor):
+    names = [column.name for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def search_jobs(conn, text=None, skills=None, posted_after=None, limit=20, cursor=None, **facets):
+    """
+    Newest-first search with keyset pagination.
+
+    Facets are passed by their API name (category, workSettings, country).
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    clauses, params = _filters(text=text, skills=skills, posted_after=posted_after, **facets)
+    if cursor:
+        clauses.append('("postedDate", id) < (%s, %s::uuid)')
+        params.extend(decode_cursor(cursor))
+
+    query = f"""
+        SELECT {", ".join(SEARCH_COLUMNS)} FROM job
+        WHERE {" AND ".join(clauses)}
+        ORDER BY "postedDate" DESC, id DESC
+        LIMIT %s
+    """
+    with conn.cursor() as cur:
+        cur.execute(query, params + [limit + 1])
+        rows = _rows(cur)
+
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def facet_counts(conn, facet, text=None, skills=None, posted_after=None, limit=50, **facets):
+    """Counts per value of one facet under the other active filters"""
+    if facet not in FACETS:
+        raise ValueError(f"unknown facet {facet!r}")
+    # a facet's own selection shouldn't narrow its counts
+    facets.pop(facet, None)
+    clauses, params = _filters(text=text, skills=skills, posted_after=posted_after, **facets)
+    column = FACETS[facet]
+    query = f"""
+        SELECT {column} AS value, count(*) AS count FROM job
+        WHERE {" AND ".join(clauses)}
+        GROUP BY {column}
+        ORDER BY count DESC
+        LIMIT %s
+    """
+    with conn.cursor() as cur:
+        cur.execute(query, params + [limit])
+        return _rows(cur)
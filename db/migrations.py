@@ -0,0 +1,132 @@
+"""
+Versioned schema changes for the job table.
+
+migrate() runs on each load but only applies the versions schema_migrations
+hasn't recorded yet. Statements are still written to be idempotent, so a
+version that failed halfway can simply run again.
+"""
+
+MIGRATIONS = [
+    (1, "job_search_vector", [
+        # array_to_string is only STABLE, generated columns need an IMMUTABLE wrapper
+        """
+        CREATE OR REPLACE FUNCTION job_array_text(TEXT[]) RETURNS TEXT
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT coalesce(array_to_string($1, ' '), '') $$
+        """,
+        """
+        ALTER TABLE job ADD COLUMN IF NOT EXISTS "searchVector" tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', job_array_text(skills)), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        ) STORED
+        """,
+        'CREATE INDEX IF NOT EXISTS job_search_vector_idx ON job USING GIN ("searchVector")',
+    ]),
+    (2, "job_skills_gin", [
+        "CREATE INDEX IF NOT EXISTS job_skills_idx ON job USING GIN (skills)",
+    ]),
+    (3, "job_facet_btree", [
+        "CREATE INDEX IF NOT EXISTS job_category_idx ON job (category)",
+        'CREATE INDEX IF NOT EXISTS job_work_settings_idx ON job ("workSettings")',
+        "CREATE INDEX IF NOT EXISTS job_country_idx ON job (country)",
+        # matches the keyset order used by db.job_search
+        'CREATE INDEX IF NOT EXISTS job_posted_date_idx ON job ("postedDate" DESC, id DESC)',
+    ]),
+    (4, "job_snapshot_history", [
+        """
+        CREATE TABLE IF NOT EXISTS job_run (
+            "runId" TEXT PRIMARY KEY,
+            "startedAt" TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            "rowCount" INTEGER DEFAULT 0,
+            "changedCount" INTEGER DEFAULT 0,
+            "closedCount" INTEGER DEFAULT 0
+        )
+        """,
+        # one append-only row per job per run, monthly partitions are added by db.snapshots
+        """
+        CREATE TABLE IF NOT EXISTS job_snapshot (
+            "runId" TEXT NOT NULL,
+            "snapshotAt" TIMESTAMP NOT NULL,
+            "companyName" TEXT,
+            "companyLogo" TEXT,
+            "jobId" TEXT,
+            "title" TEXT,
+            "location" TEXT,
+            "salary" TEXT,
+            "description" TEXT,
+            "roleCategory" TEXT,
+            "responsibilities" TEXT[],
+            "skills" TEXT[],
+            "applicationUrl" TEXT,
+            "country" TEXT,
+            "state" TEXT,
+            "city" TEXT,
+            "currency" TEXT,
+            "minSalary" INTEGER,
+            "maxSalary" INTEGER,
+            "qualifications" TEXT[],
+            "experienceLevel" TEXT,
+            "benefits" TEXT[],
+            "workSettings" TEXT,
+            "postedDate" TIMESTAMP,
+            "category" TEXT
+        ) PARTITION BY RANGE ("snapshotAt")
+        """,
+        'CREATE INDEX IF NOT EXISTS job_snapshot_run_idx ON job_snapshot ("runId", "jobId")',
+        'CREATE INDEX IF NOT EXISTS job_snapshot_job_idx ON job_snapshot ("jobId", "snapshotAt")',
+    ]),
+    (5, "job_job_id_unique", [
+        # the current-jobs upsert keys on jobId; drop older duplicates left by past reloads first
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE indexname = 'job_job_id_key') THEN
+                DELETE FROM job a USING job b
+                WHERE a."jobId" = b."jobId" AND (a."createdAt", a.id) < (b."createdAt", b.id);
+            END IF;
+        END $$
+        """,
+        'CREATE UNIQUE INDEX IF NOT EXISTS job_job_id_key ON job ("jobId")',
+    ]),
+    (6, "job_classification", [
+        # jobType was never loaded; both now come from utils.classifier
+        'ALTER TABLE job ADD COLUMN IF NOT EXISTS "classificationConfidence" REAL DEFAULT 0',
+        'ALTER TABLE job_snapshot ADD COLUMN IF NOT EXISTS "jobType" TEXT',
+        'ALTER TABLE job_snapshot ADD COLUMN IF NOT EXISTS "classificationConfidence" REAL',
+        'CREATE INDEX IF NOT EXISTS job_job_type_idx ON job ("jobType")',
+    ]),
+    (7, "job_source_site", [
+        # postings are closed per registry site, not per LLM-reported companyName
+        'ALTER TABLE job ADD COLUMN IF NOT EXISTS "siteId" TEXT',
+        'ALTER TABLE job ADD COLUMN IF NOT EXISTS "sourceUrl" TEXT',
+        'ALTER TABLE job_snapshot ADD COLUMN IF NOT EXISTS "siteId" TEXT',
+        'ALTER TABLE job_snapshot ADD COLUMN IF NOT EXISTS "sourceUrl" TEXT',
+        'CREATE INDEX IF NOT EXISTS job_site_id_idx ON job ("siteId")',
+    ]),
+]
+
+
+def migrate(cursor):
+    """Apply the migrations not applied yet, in order, and record them; returns how many ran. The caller commits"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            "version" INTEGER PRIMARY KEY,
+            "name" TEXT NOT NULL,
+            "appliedAt" TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # concurrent loads wait here instead of applying the same version twice
+    cursor.execute("SELECT pg_advisory_xact_lock(hashtext('schema_migrations'))")
+    cursor.execute('SELECT "version" FROM schema_migrations')
+    applied = {row[0] for row in cursor.fetchall()}
+    pending = [migration for migration in MIGRATIONS if migration[0] not in applied]
+    for version, name, statements in pending:
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.execute('INSERT INTO schema_migrations ("version", "name") VALUES (%s, %s)', (version, name))
+    if pending:
+        # refresh planner statistics so the new indexes are picked up right away
+        cursor.execute("ANALYZE job")
+    return len(pending)
@@ -0,0 +1,145 @@
+"""
+Append-only job history and the incrementally maintained current jobs table.
+
+Each load writes the run into the monthly-partitioned job_snapshot table and
+then brings `job` (what the job board reads) up to date from that snapshot in
+the same transaction: new postings are inserted, changed ones updated in
+place, and postings no longer listed on a site whose list page was scraped
+in this run are removed. Readers never see an empty or half-loaded table.
+"""
+import uuid
+from datetime import datetime
+
+from psycopg2.extras import execute_values
+
+# job columns refreshed from the snapshot; "postedDate" keeps the earliest value seen
+CURRENT_COLUMNS = (
+    '"companyName"', '"companyLogo"', 'title', 'location', 'salary', 'description',
+    '"roleCategory"', 'responsibilities', 'skills', '"applicationUrl"', 'country', 'state',
+    'city', 'currency', '"minSalary"', '"maxSalary"', 'qualifications', '"experienceLevel"',
+    'benefits', '"workSettings"', 'category', '"jobType"', '"classificationConfidence"', '"siteId"',
+    '"sourceUrl"',
+)
+
+
+def new_run_id(now=None):
+    # sortable by time, suffixed so back-to-back loads never collide
+    return f"{(now or datetime.now()):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+def ensure_snapshot_partition(cursor, when):
+    """Create the month partition of job_snapshot that `when` falls into"""
+    start = when.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS job_snapshot_{start:%Y_%m} PARTITION OF job_snapshot "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    )
+
+
+def write_snapshot(cursor, run_id, snapshot_at, columns, rows):
+    """Append one run's rows; columns/rows as produced by db_connector.job_row"""
+    ensure_snapshot_partition(cursor, snapshot_at)
+    cursor.execute(
+        'INSERT INTO job_run ("runId", "startedAt", "rowCount") VALUES (%s, %s, %s)',
+        (run_id, snapshot_at, len(rows)),
+    )
+    execute_values(
+        cursor,
+        f'INSERT INTO job_snapshot ("runId", "snapshotAt", {", ".join(columns)}) VALUES %s',
+        [(run_id, snapshot_at) + tuple(row) for row in rows],
+    )
+
+
+def refresh_current_jobs(cursor, run_id, snapshot_at, site_runs=None):
+    """
+    Apply a snapshot to `job`; returns (changed, closed) row counts.
+
+    site_runs: {site_id: [detail URLs listed]} for the sites whose list page
+    was scraped in this run. Only their postings can be closed, and only when
+    they were no longer listed; without it only rows replaced by a posting
+    under a new jobId are closed.
+    """
+    params = {"run_id": run_id, "snapshot_at": snapshot_at}
+    # DISTINCT ON: a posting listed twice in one run must only hit ON CONFLICT once
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in CURRENT_COLUMNS)
+    current = ", ".join(f"job.{column}" for column in CURRENT_COLUMNS)
+    incoming = ", ".join(f"EXCLUDED.{column}" for column in CURRENT_COLUMNS)
+    cursor.execute(f"""
+        INSERT INTO job ("jobId", "postedDate", {", ".join(CURRENT_COLUMNS)})
+        SELECT DISTINCT ON ("jobId") "jobId", "postedDate", {", ".join(CURRENT_COLUMNS)}
+        FROM job_snapshot
+        WHERE "runId" = %(run_id)s AND "snapshotAt" = %(snapshot_at)s
+        ORDER BY "jobId"
+        ON CONFLICT ("jobId") DO UPDATE SET
+            {updates},
+            "postedDate" = LEAST(job."postedDate", EXCLUDED."postedDate"),
+            "updatedAt" = CURRENT_TIMESTAMP
+        WHERE ({current}) IS DISTINCT FROM ({incoming})
+    """, params)
+    changed = cursor.rowcount
+
+    # the same listed page came back under a new jobId (the LLM read a
+    # different id off it): the new row keeps the old one's first-seen date
+    # and replaces it, instead of both staying open
+    superseded = """
+        s."runId" = %(run_id)s AND s."snapshotAt" = %(snapshot_at)s AND s."sourceUrl" <> ''
+        AND old."siteId" = s."siteId" AND old."sourceUrl" = s."sourceUrl" AND old."jobId" <> s."jobId"
+        AND NOT EXISTS (
+            SELECT 1 FROM job_snapshot listed
+            WHERE listed."runId" = %(run_id)s AND listed."snapshotAt" = %(snapshot_at)s AND listed."jobId" = old."jobId"
+        )
+    """
+    cursor.execute(f"""
+        UPDATE job SET "postedDate" = old."postedDate"
+        FROM job old, job_snapshot s
+        WHERE job."jobId" = s."jobId" AND old."postedDate" < job."postedDate" AND {superseded}
+    """, params)
+    cursor.execute(f'DELETE FROM job old USING job_snapshot s WHERE {superseded}', params)
+    closed = cursor.rowcount
+
+    # a site whose list page failed tonight keeps yesterday's jobs, and a
+    # posting still listed keeps its row even if its detail page failed
+    if site_runs:
+        listed = sorted({url for urls in site_runs.values() for url in urls})
+        cursor.execute("""
+            DELETE FROM job
+            WHERE "siteId" = ANY(%(sites)s::text[])
+            AND NOT (coalesce("sourceUrl", '') = ANY(%(listed)s::text[]))
+            AND NOT EXISTS (
+                SELECT 1 FROM job_snapshot s
+                WHERE s."runId" = %(run_id)s AND s."snapshotAt" = %(snapshot_at)s AND s."jobId" = job."jobId"
+            )
+        """, {**params, "sites": sorted(site_runs), "listed": listed})
+        closed += cursor.rowcount
+
+        # rows from before migration 7 have no "siteId". Back then `job` only
+        # held the last night's load, so whatever the first snapshot since
+        # didn't refresh (and give a "siteId") is gone; later runs find none
+        cursor.execute("""
+            DELETE FROM job
+            WHERE "siteId" IS NULL
+            AND "createdAt" < (SELECT "appliedAt" FROM schema_migrations WHERE "version" = 7)
+            AND NOT EXISTS (
+                SELECT 1 FROM job_snapshot s
+                WHERE s."runId" = %(run_id)s AND s."snapshotAt" = %(snapshot_at)s AND s."jobId" = job."jobId"
+            )
+        """, params)
+        closed += cursor.rowcount
+
+    cursor.execute(
+        'UPDATE job_run SET "changedCount" = %s, "closedCount" = %s WHERE "runId" = %s',
+        (changed, closed, run_id),
+    )
+    return changed, closed
+
+
+def job_history(conn, job_id):
+    """Every snapshot of one posting, oldest first"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT "runId", "snapshotAt", title, salary, location, "workSettings", "postedDate"
+            FROM job_snapshot WHERE "jobId" = %s ORDER BY "snapshotAt"
+        """, (job_id,))
+        names = [column.name for column in cur.description]
+        return [dict(zip(names, row)) for row in cur.fetchall()]
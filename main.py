@@ -1,29 +1,47 @@
+"""
+Command line entry point.
+
+    python main.py scrape [--shard i/N | --workers N] [--output-dir shards]
+    python main.py load grand_jobs_list.json | --shards shards
+    python main.py retry
+    python main.py reindex [--rebuild]
+    python main.py renormalize [--batch-size N]
+    python main.py reclassify [--train] [--threshold 0.7] [--batch-size N]
+    python main.py bench {hot,search,export,startup} [bench args]
+
+Only the standard library and light helpers are imported up front; crawl4ai,
+psycopg2, pandas and pyarrow are imported by the functions that use them so
+each subcommand pays for what it runs. `python main.py` alone still scrapes.
+"""
+import argparse
 import asyncio
-from core.extractor import job_list_extractor, job_detail_extractor_from_url
-from utils.temp_store import save_failed
-from db.db_connector import load_json_to_db
+import glob
+import importlib
+import subprocess
+import sys
+import time
+from utils import temp_store
+from utils.temp_store import save_failed, load_failed
 # from utils.notifier import send_email, send_whatsapp_alert
 # from core.retry_handler import retry_failed
 import json
-from utils.load_url import load_urls_from_csv
 import os
 from datetime import datetime
 import hashlib
-from utils.logger import setup_scraping_logger
-from utils.email_sender import send_completion_email
-logger = setup_scraping_logger(name="Job scrapinng")
+from utils.logger import setup_scraping_logger, log_context
+logger = setup_scraping_logger()
 
 def generate_unique_id(data):
-    job_id_raw = (data.get("jobId") or "").strip()
-    company_name = (data.get("companyName") or "").strip().replace(" ", "_").lower()
+    job_id_raw = (data.jobId or "").strip()
+    company_name = (data.companyName or "").strip().replace(" ", "_").lower()
 
     if job_id_raw:
         return f"{company_name}_{job_id_raw}"
 
     # Fallback: use hash of application URL + title + location
-    application_url = data.get("applicationUrl")
-    title = data.get("title", "")
-    location = data.get("location", "")
+    application_url = data.applicationUrl
+    title = data.title
+    location = data.location
 
     fallback_string = f"{company_name}_{title}_{location}_{application_url}"
     hash_digest = hashlib.sha256(fallback_string.encode("utf-8")).hexdigest()[:10]  # short hash
@@ -40,136 +58,427 @@ def convert_date(obj):
         else: return f"{obj}"
         # raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
 
+def save_site_runs(site_runs, filename="site_runs.json"):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(site_runs, f)
+        return filename
+
+def load_site_runs(filename="site_runs.json"):
+    """{site_id: [listed detail URLs]} written by run(), None if the file is missing"""
+    if not os.path.exists(filename):
+        return None
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 def save_to_json(data, filename="grand_jobs_list.json"):
     with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+        # compact, analytics read the Parquet export instead
+        json.dump([job.model_dump() for job in data], f, ensure_ascii=False)
         return filename
-async def run():
-    print("start function ✈️✈️")
+
+def parse_shard(value):
+    """Parse an 'i/N' shard spec into (index, count)"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in [0, {count}), got {value!r}")
+    return index, count
+
+def shard_for_site(url, count):
+    # hashlib rather than hash() so every process and runner agrees on the split
+    key = f"{url.get('company_name') or ''}|{url.get('url') or ''}"
+    return int(hashlib.sha1(key.encode("utf-8")).hexdigest(), 16) % count
+
+def select_shard(urls, index, count):
+    return [url for url in urls if shard_for_site(url, count) == index]
+
+def shard_paths(output_dir, index, count):
+    suffix = f"shard-{index}-of-{count}"
+    return (
+        os.path.join(output_dir, f"grand_jobs_list.{suffix}.json"),
+        os.path.join(output_dir, f"failed_jobs.{suffix}.json"),
+        os.path.join(output_dir, f"site_stats.{suffix}.json"),
+        os.path.join(output_dir, f"site_runs.{suffix}.json"),
+    )
+
+def dedup_jobs(jobs):
+    """Keep the first record per jobId, preserving order"""
+    seen = set()
+    unique = []
+    for job in jobs:
+        job_id = job.jobId
+        if job_id in seen:
+            continue
+        seen.add(job_id)
+        unique.append(job)
+    return unique
+
+def merge_shard_outputs(output_dir):
+    from utils.site_registry import merge_site_stats
+
+    failed_jobs = []
+    job_files = sorted(glob.glob(os.path.join(output_dir, "grand_jobs_list.shard-*.json")))
+    jobs = load_job_files(job_files)
+    for path in sorted(glob.glob(os.path.join(output_dir, "failed_jobs.shard-*.json"))):
+        failed_jobs.extend(load_failed(path))
+    merge_site_stats(sorted(glob.glob(os.path.join(output_dir, "site_stats.shard-*.json"))))
+    site_runs = {}
+    for path in sorted(glob.glob(os.path.join(output_dir, "site_runs.shard-*.json"))):
+        site_runs.update(load_site_runs(path))
+
+    counts = {path.rsplit("-of-", 1)[-1].split(".")[0] for path in job_files}
+    if len(counts) == 1:
+        expected = int(counts.pop())
+        if len(job_files) < expected:
+            logger.warning(f"Only {len(job_files)}/{expected} shard outputs found in {output_dir}")
+    logger.info(f"Merged {len(jobs)} jobs from {len(job_files)} shard files")
+    return jobs, failed_jobs, site_runs
+
+def run_local_shards(workers, output_dir):
+    """Run every shard as a separate `main.py scrape --shard` process and wait for them"""
+    # drop outputs of earlier runs so the merge only sees this run's shards
+    for path in glob.glob(os.path.join(output_dir, "*.shard-*-of-*.json")):
+        os.remove(path)
+    processes = [
+        subprocess.Popen(
+            [
+                sys.executable, os.path.abspath(__file__),
+                "scrape", "--shard", f"{i}/{workers}", "--output-dir", output_dir,
+            ],
+            # one rotating log per process, rotation breaks when several write the same file
+            env={**os.environ, "SCRAPING_LOG_FILE": f"scraping_job.shard-{i}-of-{workers}.log"},
+        )
+        for i in range(workers)
+    ]
+    for i, process in enumerate(processes):
+        if process.wait() != 0:
+            logger.error(f"Shard {i}/{workers} exited with code {process.returncode}")
+
+async def scrape_detail(job, site, provider, api_token, semaphore, latencies, position, company_logo=""):
+    """Fetch one detail page under the site's concurrency limit and build its record"""
+    from core.extractor import job_detail_extractor_from_url
+    from core.fetch_policy import hedged
+    from utils.classifier import LABELS, classify, classify_job, confident_fields
+    from utils.location import normalize_job_location
+
+    application_url = job.applicationUrl
+    # runs as its own task, so this context stays with this job's records
+    with log_context(job=application_url or job.title, stage="detail"):
+        logger.info("Processing %s", position, extra={"sample": True})
+        if not application_url:
+            logger.warning("Missing application URL for job: %s", job.title)
+            return None
+
+        # the listing title often settles these already, only the rest go to the LLM
+        listed = classify(job.title, job.description)
+        classified = confident_fields(listed)
+        skip_fields = classified + (("companyLogo",) if company_logo else ())
+        async with semaphore:
+            started = time.perf_counter()
+            data = await hedged(
+                lambda: job_detail_extractor_from_url(
+                    url=application_url, provider=provider, api_token=api_token, site=site,
+                    skip_fields=skip_fields,
+                ),
+                site.get("hedge_after"),
+                semaphore,
+            ) #returns JobData or None
+            latencies.append(time.perf_counter() - started)
+        if data is None:
+            logger.info("No structured data extracted from %s", application_url)
+            return None
+        data = normalize_job_location(data)
+        data = classify_job(data, asked=[field for field in LABELS if field not in classified], known=listed)
+        postedDate = datetime.now()
+        postedDate=convert_date(postedDate)
+        site_postedDate= job.postedDate or data.postedDate
+        # connstruct_jobid to track duplicates
+        jobId = generate_unique_id(data)
+        logger.debug("unique job id %s", jobId)
+        return data.model_copy(update={
+            "jobId":jobId,
+            "applicationUrl":data.applicationUrl or job.applicationUrl,
+            "postedDate":site_postedDate or postedDate,
+            "companyLogo":company_logo or data.companyLogo,
+            "siteId":site["site_id"],
+            "sourceUrl":application_url,
+        })
+
+async def run(shard=None, output_file="grand_jobs_list.json", stats_file=None, sites=None, runs_file="site_runs.json"):
+    """
+    Scrape every registered site (or just `sites`) and write the records to output_file.
+
+    Returns (records, site_runs); site_runs, also written to runs_file, maps
+    each site whose list page was scraped to the detail URLs it listed.
+    """
+    from core.extractor import job_list_extractor
+    from core.fetch_policy import apply_fetch_policy
+    from utils.site_registry import load_site_profiles, load_site_stats, save_site_stats, record_site_run, SITE_STATS_FILE
+    from utils.asset_cache import resolve_company_logos, public_logo_url
+
     logger.info("Starting web scraping job")
     open_provider =os.getenv("PROVIDER")
     openai_api_token = os.getenv("OPENAI_API_KEY")
-    print("open ai key", openai_api_token[:4])
-    print("open ai provider", open_provider[:4])
+    logger.info(f"Using provider {open_provider}")
         
-    urls = load_urls_from_csv(r"treat_static_job.csv",column_name='power_url',column_css="wait_for")
+    urls = sites if sites is not None else load_site_profiles()
+    if shard:
+        urls = select_shard(urls, *shard)
+        logger.info(f"Running shard {shard[0]}/{shard[1]}")
     logger.info(f"Found {len(urls)} sites")
+    site_stats = load_site_stats()
+    try:
+        # once per company for the whole run, not once per posting
+        logos = await resolve_company_logos(urls)
+    except Exception as e:
+        logger.error(f"Logo resolution failed, falling back to the LLM: {e}")
+        logos = {}
+    logger.info(f"Cached logos for {len(logos)} companies")
     grand_jobs_list = []
+    site_runs = {}
      
     for i, url in enumerate(urls):
         company_job_list=[]
-        try:
-            company_name=url["company_name"]
-            print(f"\n📄 Processing {i+1}/{len(urls)}: {company_name}")
-            logger.info(f"Processing {i+1}/{len(urls)}: {company_name}")
-            jobs_per_site = await job_list_extractor(url=url, provider=open_provider, api_token=openai_api_token)
-            
-            logger.info(f"Found {len(jobs_per_site)} of jobd")
-            # append_jsonl(jobs_per_site, filename="sites_datas_store.jsonl")
-            # print(f"Found number {len(jobs_per_site)} of job") 
-            
-            
-            if jobs_per_site:
-                # append_jsonl(jobs_per_site, filename=f"{company_name}_backup.jsonl")
-               
-                print(f"<<<<<< ✅Scraping detail page✅ >>>>>>")
-                for m, job in enumerate(jobs_per_site):
-                  
-                    print(f"\n📄 Processing {m+1}/{len(jobs_per_site)}: {company_name}")
-                    logger.info(f"Processing {m+1}/{len(jobs_per_site)}: {company_name}")
-                    # print("job", job)
-                    application_url = job.get("applicationUrl")
-                    print("applicayion", application_url)
-                    if not application_url:
-                        print(f"⚠️ Missing application URL for job: {job.get('title')}")
-                        continue
-
-                    data = await job_detail_extractor_from_url(url=application_url, provider=open_provider, api_token=openai_api_token) #returns a dictionary
-                    postedDate = datetime.now()
-                    postedDate=convert_date(postedDate)
-                    site_postedDate= job.get("postedDate") or data.get("postedDate")
-                    # connstruct_jobid to track duplicates
-                    jobId = generate_unique_id(data)
-                    print("unique job id", jobId)
-                    list_data = {
-                        "jobId":jobId,
-                        "title":data.get("title",""),
-                        "applicationUrl":data.get("applicationUrl") or job.get("applicationUrl",""),
-                        "description":data.get("description"),
-                        "location":data.get("location"),
-                        "country":data.get("country"),
-                        "state":data.get("state"),
-                        "city":data.get("city"),
-                        "jobType":data.get("jobType"),
-                        "salary":data.get("salary"),
-                        "skills":data.get("skills"),
-                        "experienceLevel":data.get("experienceLevel"),
-                        "currency":data.get("currency"),
-                        "benefits":data.get("benefits"),
-                        "approvalStatus":data.get("approvalStatus"),
-                        "jobStatus":data.get("jobStatus"),
-                        "responsibilities":data.get("responsibilities"),
-                        "workSettings":data.get("workSettings"),
-                        "roleCategory":data.get("roleCategory"),
-                        "qualifications":data.get("qualifications"),
-                        "companyLogo":data.get("companyLogo"),
-                        "companyName":data.get("companyName"),
-                        "minSalary":data.get("minSalary"),
-                        "maxSalary":data.get("maxSalary"),
-                        "postedDate":site_postedDate or postedDate,
-                        "category":data.get("category"),                         
-                    }
-                    # save for each site
-                    company_job_list.append(list_data)
-                    grand_jobs_list.append(list_data)
-            else: 
-                print("⚠️ No jobs found on page.")
-                save_failed({"url": url, "html": data})
-                    # send_email("Extraction Error", f"Failed to extract from {url}")
-                    # send_whatsapp_alert(f"⚠️ Extraction failed: {url}")
-            # save_failed({"url": url, "html": data})
-            # send_email("Scraping Error", f"Failed to fetch {url}")
-            # send_whatsapp_alert(f"⚠️ Fetch failed: {url}")
-        except Exception as e:           
-            # print(f"❌ Error while processing {url.get('company_name')}: {e}")
-            save_failed({"url": url, "error": str(e)})
-        logger.info(f"Save {len(company_job_list)} for {company_name}") 
-        print(f"Save {len(company_job_list)} for {company_name}")   
+        url = apply_fetch_policy(url, site_stats)
+        company_name=url["company_name"]
+        jobs_per_site = []
+        list_latency = None
+        detail_latencies = []
+        with log_context(site=url["site_id"], stage="list"):
+            try:
+                logger.info(f"Processing {i+1}/{len(urls)}: {company_name}")
+                started = time.perf_counter()
+                jobs_per_site = await job_list_extractor(url=url, provider=open_provider, api_token=openai_api_token)
+                list_latency = time.perf_counter() - started
+                
+                logger.info(f"Found {len(jobs_per_site)} jobs")
+                # append_jsonl(jobs_per_site, filename="sites_datas_store.jsonl")
+                
+                if jobs_per_site:
+                    # append_jsonl(jobs_per_site, filename=f"{company_name}_backup.jsonl")
+                    semaphore = asyncio.Semaphore(max(1, int(url.get("concurrency") or 1)))
+                    company_logo = public_logo_url(logos.get(company_name))
+                    # one failed detail page must not cost the site's other records
+                    records = await asyncio.gather(*(
+                        scrape_detail(job, url, open_provider, openai_api_token, semaphore, detail_latencies, f"{m+1}/{len(jobs_per_site)}", company_logo)
+                        for m, job in enumerate(jobs_per_site)
+                    ), return_exceptions=True)
+                    for job, list_data in zip(jobs_per_site, records):
+                        if isinstance(list_data, Exception):
+                            logger.error(f"Detail extraction failed for {job.applicationUrl or job.title}: {list_data}")
+                            save_failed({"url": url, "job_url": job.applicationUrl, "error": str(list_data), "error_type": type(list_data).__name__})
+                            continue
+                        if list_data is None:
+                            continue
+                        # save for each site
+                        company_job_list.append(list_data)
+                        grand_jobs_list.append(list_data)
+                    # the load closes this site's postings that are no longer listed
+                    site_runs[url["site_id"]] = [job.applicationUrl for job in jobs_per_site if job.applicationUrl]
+                else: 
+                    logger.warning("No jobs found on page")
+                    save_failed({"url": url, "error": "no jobs found on page", "error_type": "NoJobsFound"})
+                        # send_email("Extraction Error", f"Failed to extract from {url}")
+                        # send_whatsapp_alert(f"⚠️ Extraction failed: {url}")
+                # save_failed({"url": url, "html": data})
+                # send_email("Scraping Error", f"Failed to fetch {url}")
+                # send_whatsapp_alert(f"⚠️ Fetch failed: {url}")
+            except Exception as e:           
+                logger.error(f"Error while processing {company_name}: {e}")
+                save_failed({"url": url, "error": str(e), "error_type": type(e).__name__})
+            if list_latency is not None:
+                record_site_run(site_stats, url["site_id"], list_latency, detail_latencies, len(jobs_per_site), len(company_job_list), domain=url["domain"])
+            logger.info(f"Save {len(company_job_list)} for {company_name}") 
         # save_to_json(company_job_list, filename=f"{company_name}.json")
-    final_data_path = save_to_json(grand_jobs_list) 
-    print("saved to file:", final_data_path)  
-    return grand_jobs_list 
-        
-if __name__ == "__main__":
-   
-    result = asyncio.run(run())    
-    
-    failed_jobs = []
+    save_site_stats(site_stats, stats_file or SITE_STATS_FILE)
+    final_data_path = save_to_json(grand_jobs_list, filename=output_file)
+    save_site_runs(site_runs, filename=runs_file)
+    logger.info(f"saved to file: {final_data_path}")
+    return grand_jobs_list, site_runs
+
+def finish(result, failed_jobs, site_runs=None):
+    """Single load step: dedup, export, write to the database and report the run"""
+    from db.db_connector import load_json_to_db
+    from db.snapshots import new_run_id
+    from utils.parquet_export import export_run
+    from utils.reporting import build_report, send_report, wait_for_reports
+
+    laod_data = None
+    run_id = None
+    result = dedup_jobs(result)
     if result:
-        # save to database
-        laod_data = load_json_to_db(result)
-        print("print saved ✅✅✈️✅")
-    try:
-        with open("failed_jobs.json", "r", encoding="utf-8") as f:
-                failed_jobs = json.load(f)
-    except Exception:
-        pass
-    success_count = len(result)
-    failed_count = len(failed_jobs)
-    email_body = (
-            f"The job scraping script has finished running.\n\n"
-            f"Successful jobs: {success_count}\n"
-            f"Saved jobs: {laod_data}\n"
-            f"Failed jobs: {failed_count}\n\n"
-            f"Failed jobs details:\n{json.dumps(failed_jobs, indent=2, ensure_ascii=False)}"
-        )
-    send_completion_email(
-            subject="Job Scraping Completed",
-            body=email_body,
-            to_email=os.getenv("MAIL_TO"),
-        ) 
+        # one id for the Parquet export and the database snapshot of this run
+        run_id = new_run_id()
+        with log_context(run_id=run_id, stage="load"):
+            try:
+                logger.info(f"exported to: {export_run(result, run_id)}")
+            except Exception as e:
+                logger.error(f"Parquet export failed: {e}")
+            # save to database
+            if site_runs is None:
+                logger.warning("No site runs recorded, postings missing from this run stay open")
+            laod_data = load_json_to_db(result, run_id=run_id, site_runs=site_runs)
+            logger.info(f"Database load: {laod_data}")
+    report = build_report(len(result), laod_data, failed_jobs, run_id=run_id)
+    print(report["text"])
+    send_report(report, logger=logger)
+    still_sending = wait_for_reports()
+    if still_sending:
+        logger.warning(f"Gave up waiting for report sinks: {', '.join(still_sending)}")
     
     print(f"Final job list {len(result)}")
 
-    
-    # transform data
\ No newline at end of file
+def load_job_files(paths):
+    from core.job_detail_model import to_jobs
+
+    jobs = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            jobs.extend(to_jobs(json.load(f)))
+    return jobs
+
+def failed_sites(failures):
+    """
+    Current registry profiles of the sites behind recorded failures, in first-seen order.
+
+    Only the site_id is taken from a failure: the stored profile already has
+    that night's fetch policy applied, run() applies tonight's.
+    """
+    from utils.site_registry import load_site_profiles
+
+    site_ids = []
+    for failure in failures:
+        site = failure.get("url")
+        # only registry profiles can be re-scraped, older entries hold a bare URL
+        if isinstance(site, dict) and site.get("site_id") and site["site_id"] not in site_ids:
+            site_ids.append(site["site_id"])
+    profiles = {profile["site_id"]: profile for profile in load_site_profiles()}
+    # a site removed or disabled since is not retried
+    return [profiles[site_id] for site_id in site_ids if site_id in profiles]
+
+def cmd_scrape(args):
+    if args.shard:
+        os.makedirs(args.output_dir, exist_ok=True)
+        jobs_file, failed_file, stats_file, runs_file = shard_paths(args.output_dir, *args.shard)
+        temp_store.FAILED_FILE = failed_file
+        asyncio.run(run(shard=args.shard, output_file=jobs_file, stats_file=stats_file, runs_file=runs_file))
+    elif args.workers:
+        os.makedirs(args.output_dir, exist_ok=True)
+        run_local_shards(args.workers, args.output_dir)
+        result, failed_jobs, site_runs = merge_shard_outputs(args.output_dir)
+        save_to_json(result)
+        save_site_runs(site_runs)
+        finish(result, failed_jobs, site_runs)
+    else:
+        result, site_runs = asyncio.run(run())
+        finish(result, load_failed(), site_runs)
+    return 0
+
+def cmd_load(args):
+    if args.shards:
+        result, failed_jobs, site_runs = merge_shard_outputs(args.shards)
+        save_to_json(result)
+        save_site_runs(site_runs)
+    else:
+        result = load_job_files(args.files or ["grand_jobs_list.json"])
+        failed_jobs = load_failed(args.failed_file)
+        site_runs = load_site_runs(args.site_runs)
+    finish(result, failed_jobs, site_runs)
+    return 0
+
+def cmd_retry(args):
+    temp_store.FAILED_FILE = args.failed_file
+    sites = failed_sites(load_failed())
+    if not sites:
+        print("Nothing to retry")
+        return 0
+    logger.info(f"Retrying {len(sites)} failed sites")
+    # keep the old failures aside, this run records its own
+    os.replace(args.failed_file, args.failed_file + ".retried")
+    result, site_runs = asyncio.run(run(sites=sites, output_file=args.output, runs_file="retry_site_runs.json"))
+    finish(result, load_failed(), site_runs)
+    return 0
+
+def cmd_reindex(args):
+    from db.db_connector import reindex_jobs
+
+    print(reindex_jobs(rebuild=args.rebuild))
+    return 0
+
+def cmd_renormalize(args):
+    from db.db_connector import renormalize_job_locations
+
+    print(renormalize_job_locations(batch_size=args.batch_size))
+    return 0
+
+def cmd_reclassify(args):
+    from db.db_connector import reclassify_jobs, train_job_classifier
+
+    if args.train:
+        print(train_job_classifier())
+    print(reclassify_jobs(batch_size=args.batch_size, threshold=args.threshold))
+    return 0
+
+BENCHMARKS = {
+    "hot": "bench.run_bench",
+    "search": "bench.search_bench",
+    "export": "bench.export_bench",
+    "startup": "bench.startup_bench",
+}
+
+def cmd_bench(args):
+    return importlib.import_module(BENCHMARKS[args.suite]).main(args.bench_args)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape job sites and load them into the database")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    scrape = commands.add_parser("scrape", help="scrape every site, then load (default)")
+    mode = scrape.add_mutually_exclusive_group()
+    mode.add_argument("--shard", type=parse_shard, metavar="i/N",
+                      help="scrape only shard i of N and write its output to --output-dir (no load step)")
+    mode.add_argument("--workers", type=int, metavar="N",
+                      help="run N shard processes locally, then merge and load")
+    scrape.add_argument("--output-dir", default="shards", help="where shard outputs are written")
+    scrape.set_defaults(handler=cmd_scrape)
+
+    load = commands.add_parser("load", help="load scraped JSON into the database")
+    load.add_argument("files", nargs="*", help="JSON job lists (default grand_jobs_list.json)")
+    load.add_argument("--shards", metavar="DIR", help="merge the shard outputs in DIR and load them instead")
+    load.add_argument("--failed-file", default=temp_store.FAILED_FILE, help="failures to report with the load")
+    load.add_argument("--site-runs", default="site_runs.json",
+                      help="sites scraped with the files; without it no postings are closed")
+    load.set_defaults(handler=cmd_load)
+
+    retry = commands.add_parser("retry", help="re-scrape the sites recorded in the failed jobs file, then load")
+    retry.add_argument("--failed-file", default=temp_store.FAILED_FILE)
+    retry.add_argument("--output", default="retry_jobs_list.json")
+    retry.set_defaults(handler=cmd_retry)
+
+    reindex = commands.add_parser("reindex", help="apply database migrations and refresh statistics")
+    reindex.add_argument("--rebuild", action="store_true", help="also rebuild the job indexes concurrently")
+    reindex.set_defaults(handler=cmd_reindex)
+
+    renormalize = commands.add_parser("renormalize", help="re-normalize stored job locations with the local gazetteer")
+    renormalize.add_argument("--batch-size", type=int, default=1000)
+    renormalize.set_defaults(handler=cmd_renormalize)
+
+    reclassify = commands.add_parser("reclassify", help="re-run the job type/settings/level/category classifier over stored jobs")
+    reclassify.add_argument("--train", action="store_true", help="first fit the model on the stored labels (needs scikit-learn)")
+    reclassify.add_argument("--threshold", type=float, help="confidence needed to override a stored label")
+    reclassify.add_argument("--batch-size", type=int, default=1000)
+    reclassify.set_defaults(handler=cmd_reclassify)
+
+    bench = commands.add_parser("bench", help="run a benchmark from bench/")
+    bench.add_argument("suite", choices=sorted(BENCHMARKS))
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER, help="passed on to the benchmark")
+    bench.set_defaults(handler=cmd_bench)
+
+    argv = sys.argv[1:] if argv is None else argv
+    return parser.parse_args(argv or ["scrape"])
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(args.handler(args))
@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+
+from core.fetch_policy import hedged
+
+
+class HedgedTest(unittest.IsolatedAsyncioTestCase):
+    async def run_jobs(self, concurrency, jobs, result=None, delay=0.2):
+        semaphore = asyncio.Semaphore(concurrency)
+        state = {"active": 0, "peak": 0, "calls": 0}
+
+        async def call():
+            state["calls"] += 1
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            try:
+                await asyncio.sleep(delay)
+                return result
+            finally:
+                state["active"] -= 1
+
+        async def job():
+            # same shape as main.scrape_detail
+            async with semaphore:
+                return await hedged(call, 0.05, semaphore)
+
+        results = await asyncio.wait_for(asyncio.gather(*(job() for _ in range(jobs))), timeout=5)
+        return results, state
+
+    async def test_first_attempt_returning_none_while_slots_are_busy_does_not_hang(self):
+        for concurrency, jobs in ((1, 1), (1, 3), (2, 2), (2, 6)):
+            with self.subTest(concurrency=concurrency, jobs=jobs):
+                results, state = await self.run_jobs(concurrency, jobs)
+                self.assertEqual(results, [None] * jobs)
+                self.assertLessEqual(state["peak"], concurrency)
+
+    async def test_hedges_into_a_free_slot_without_exceeding_the_limit(self):
+        results, state = await self.run_jobs(3, 1, result="job")
+        self.assertEqual(results, ["job"])
+        self.assertEqual(state["calls"], 2)
+        self.assertLessEqual(state["peak"], 3)
+
+    async def test_first_attempt_error_is_raised_when_no_slot_is_free(self):
+        semaphore = asyncio.Semaphore(1)
+
+        async def call():
+            await asyncio.sleep(0.1)
+            raise TimeoutError("page timeout")
+
+        async with semaphore:
+            with self.assertRaises(TimeoutError):
+                await asyncio.wait_for(hedged(call, 0.05, semaphore), timeout=5)
+        self.assertFalse(semaphore.locked())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+"""
+Per-company logo cache.
+
+Each company's logo is resolved once per run from its website (or the
+`logo_url` site setting), downloaded with bounded concurrency and stored
+content-addressed under assets/:
+
+    assets/blobs/ab/ab12.../original.png
+    assets/blobs/ab/ab12.../64.png, 128.png, 256.png
+    assets/companies/<company>.json      source URL, hash and variant paths
+
+Only declared logos of at least MIN_LOGO_SIZE px count, a bare favicon is
+not a logo. Jobs of a company with a cached logo get it without asking the
+LLM. With ASSET_BASE_URL set (where assets/ is published), companyLogo
+points at the cached 128px variant, otherwise at the resolved source URL.
+"""
+import asyncio
+import hashlib
+import io
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from urllib.parse import urljoin
+
+ASSET_DIR = os.getenv("ASSET_DIR", "assets")
+ASSET_BASE_URL = os.getenv("ASSET_BASE_URL", "").rstrip("/")
+LOGO_SIZES = (64, 128, 256)
+PUBLIC_SIZE = 128
+# smaller images are favicons, the LLM's pick from the careers page is better
+MIN_LOGO_SIZE = 64
+DOWNLOAD_CONCURRENCY = 4
+MAX_LOGO_BYTES = 2 * 1024 * 1024
+# a resolved logo is trusted for this long before the website is checked again
+REFRESH_DAYS = 7
+USER_AGENT = "Mozilla/5.0 (compatible; gigs-tech-scraper)"
+
+EXTENSIONS = {
+    "image/png": "png", "image/jpeg": "jpg", "image/gif": "gif", "image/webp": "webp",
+    "image/svg+xml": "svg", "image/x-icon": "ico", "image/vnd.microsoft.icon": "ico",
+}
+
+# <link rel="apple-touch-icon" ...>, <link rel="icon" ...>, <meta property="og:logo|og:image" ...>
+TAG_PATTERN = re.compile(r"<(?:link|meta)\b[^>]*>", re.I)
+ATTR_PATTERN = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+
+def company_key(company_name):
+    return re.sub(r"[^a-z0-9]+", "-", company_name.lower()).strip("-") or "unknown"
+
+
+def _record_path(company_name, root=ASSET_DIR):
+    return os.path.join(root, "companies", f"{company_key(company_name)}.json")
+
+
+def load_logo_record(company_name, root=ASSET_DIR):
+    path = _record_path(company_name, root)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (ValueError, OSError):
+        return None
+
+
+def _save_record(record, root=ASSET_DIR):
+    path = _record_path(record["company_name"], root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2)
+
+
+def _is_fresh(record, now):
+    try:
+        resolved = datetime.fromisoformat(record["resolved_at"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return now - resolved < timedelta(days=REFRESH_DAYS)
+
+
+def logo_candidates(html, page_url):
+    """Logo URLs declared by a homepage, best first"""
+    ranked = []
+    for tag in TAG_PATTERN.findall(html):
+        attrs = {name.lower(): (a or b).strip() for name, a, b in ATTR_PATTERN.findall(tag)}
+        rel = attrs.get("rel", "").lower()
+        prop = attrs.get("property", attrs.get("name", "")).lower()
+        href = attrs.get("href") or attrs.get("content")
+        if not href or href.startswith("data:"):
+            continue
+        if "apple-touch-icon" in rel:
+            rank = 0
+        elif prop == "og:logo":
+            rank = 1
+        elif "icon" in rel.split():
+            # prefer the largest declared size
+            sizes = [int(s) for s in re.findall(r"(\d+)x\d+", attrs.get("sizes", ""))]
+            rank = 2 - (max(sizes) / 10000 if sizes else 0)
+        elif prop == "og:image":
+            # often a banner rather than a logo
+            rank = 3
+        else:
+            continue
+        ranked.append((rank, urljoin(page_url, href)))
+    ranked.sort(key=lambda item: item[0])
+    return list(dict.fromkeys(url for _, url in ranked))
+
+
+def image_size(content, content_type):
+    """(width, height) of a raster image, None for SVG or unreadable content"""
+    if content_type == "image/svg+xml":
+        return None
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(content)) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def is_real_logo(record):
+    """Vector, or a raster whose larger side is at least MIN_LOGO_SIZE; older records without a size are not"""
+    if not record:
+        return False
+    if record.get("content_type") == "image/svg+xml":
+        return True
+    size = record.get("size") or (0, 0)
+    return max(size) >= MIN_LOGO_SIZE
+
+
+def store_asset(content, content_type, root=ASSET_DIR):
+    """Write the original and resized PNG variants under the content hash; returns (sha256, variants)"""
+    digest = hashlib.sha256(content).hexdigest()
+    folder = os.path.join("blobs", digest[:2], digest)
+    os.makedirs(os.path.join(root, folder), exist_ok=True)
+
+    original = os.path.join(folder, f"original.{EXTENSIONS.get(content_type, 'bin')}")
+    variants = {"original": original}
+    if not os.path.exists(os.path.join(root, original)):
+        with open(os.path.join(root, original), "wb") as f:
+            f.write(content)
+
+    if content_type == "image/svg+xml":
+        # vector, scales on its own
+        return digest, variants
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(content)) as image:
+            image.load()
+            image = image.convert("RGBA")
+            for size in LOGO_SIZES:
+                path = os.path.join(folder, f"{size}.png")
+                if not os.path.exists(os.path.join(root, path)):
+                    variant = image.copy()
+                    variant.thumbnail((size, size))
+                    variant.save(os.path.join(root, path), format="PNG", optimize=True)
+                variants[str(size)] = path
+    except Exception:
+        # unreadable image, keep the original only
+        pass
+    return digest, variants
+
+
+def public_logo_url(record):
+    """companyLogo for a company's jobs, "" (ask the LLM) without a real logo"""
+    if not is_real_logo(record):
+        return ""
+    variants = record.get("variants") or {}
+    path = variants.get(str(PUBLIC_SIZE)) or variants.get("original")
+    if ASSET_BASE_URL and path:
+        return f"{ASSET_BASE_URL}/{path.replace(os.sep, '/')}"
+    return record.get("source") or ""
+
+
+async def _download(client, url):
+    response = await client.get(url)
+    response.raise_for_status()
+    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    return response.content, content_type
+
+
+async def _resolve(client, company_name, sites, root):
+    explicit = next((site["logo_url"] for site in sites if site.get("logo_url")), None)
+    candidates = [explicit] if explicit else []
+    website = next((site["company_website"] for site in sites if site.get("company_website")), None)
+    if not explicit and website:
+        try:
+            html, _ = await _download(client, website)
+            candidates = logo_candidates(html.decode("utf-8", "replace"), website)
+        except Exception:
+            candidates = []
+
+    for url in candidates:
+        try:
+            content, content_type = await _download(client, url)
+        except Exception:
+            continue
+        if not content or len(content) > MAX_LOGO_BYTES or not content_type.startswith("image/"):
+            continue
+        size = image_size(content, content_type)
+        if content_type != "image/svg+xml" and (not size or max(size) < MIN_LOGO_SIZE):
+            continue
+        digest, variants = store_asset(content, content_type, root)
+        return {
+            "company_name": company_name,
+            "source": url,
+            "sha256": digest,
+            "content_type": content_type,
+            "size": list(size) if size else None,
+            "variants": variants,
+            "resolved_at": datetime.now().isoformat(timespec="seconds"),
+        }
+    return None
+
+
+async def resolve_company_logos(sites, root=ASSET_DIR, concurrency=DOWNLOAD_CONCURRENCY, now=None):
+    """
+    {company_name: logo record} for every company behind `sites`.
+
+    Companies are resolved once each however many listing URLs they have;
+    records younger than REFRESH_DAYS are reused without touching the network.
+    """
+    import httpx
+
+    now = now or datetime.now()
+    by_company = {}
+    for site in sites:
+        by_company.setdefault(site["company_name"], []).append(site)
+
+    logos = {}
+    stale = []
+    for company_name, company_sites in by_company.items():
+        record = load_logo_record(company_name, root)
+        if is_real_logo(record) and _is_fresh(record, now):
+            logos[company_name] = record
+        else:
+            stale.append(company_name)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(
+        timeout=15, follow_redirects=True, headers={"User-Agent": USER_AGENT}
+    ) as client:
+
+        async def resolve(company_name):
+            async with semaphore:
+                try:
+                    return company_name, await _resolve(client, company_name, by_company[company_name], root)
+                except Exception:
+                    return company_name, None
+
+        for company_name, record in await asyncio.gather(*(resolve(name) for name in stale)):
+            if record:
+                _save_record(record, root)
+                logos[company_name] = record
+            else:
+                # keep last run's logo rather than falling back to the LLM
+                previous = load_logo_record(company_name, root)
+                if is_real_logo(previous):
+                    logos[company_name] = previous
+    return logos
@@ -0,0 +1,269 @@
+"""
+Local classification of jobType, workSettings, experienceLevel and category.
+
+Each field has a precompiled keyword table scored over the title (weighted)
+and description; experienceLevel words only count in the title. An optional
+TF-IDF + logistic regression model, trained on the labels already in the
+`job` table (`python main.py reclassify --train`), is blended in when
+scikit-learn and a saved model are available. Every
+prediction carries a confidence in [0, 1]; the detail prompt only asks the
+LLM for fields the classifier isn't sure about.
+"""
+import math
+import os
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+MODEL_PATH = os.getenv("CLASSIFIER_MODEL", "models/job_classifier.joblib")
+# below this the LLM's answer is asked for and preferred
+CONFIDENCE_THRESHOLD = float(os.getenv("CLASSIFY_THRESHOLD", 0.7))
+TITLE_WEIGHT = 3
+# a long description repeating one word shouldn't outvote the title
+MAX_DESCRIPTION_HITS = 3
+
+LABELS = {
+    "jobType": ("fullTime", "partTime", "contractToHire", "tempContract", "gigWork"),
+    "workSettings": ("remote", "onSite", "hybrid"),
+    "experienceLevel": ("beginner", "intermediate", "expert", "experienced"),
+    "category": (
+        "developer", "consultant", "sales", "administrator", "architect", "analytics", "automation", "engineer", "",
+    ),
+}
+# what a field falls back to with no evidence at all, same as the job table defaults
+DEFAULTS = {"jobType": "fullTime", "workSettings": "", "experienceLevel": "experienced", "category": ""}
+# seniority words in a description are mostly verbs and other people ("lead
+# workshops", "report to the Director"), only the title's count; the
+# description still contributes its years of experience
+TITLE_ONLY_FIELDS = ("experienceLevel",)
+
+# label -> patterns, in priority order: where two labels match at the same
+# position the earlier one wins ("contract to hire" is not a plain "contract")
+KEYWORDS = {
+    "jobType": {
+        "contractToHire": [r"contract[- ]to[- ](?:hire|perm\w*)", r"c2h", r"temp[- ]to[- ]perm\w*", r"right[- ]to[- ]hire"],
+        "partTime": [r"part[- ]?time"],
+        "gigWork": [r"freelanc\w*", r"gig", r"project[- ]based", r"per[- ]project"],
+        "tempContract": [
+            r"contract(?:or|ual)?", r"temporary", r"temp", r"fixed[- ]term", r"c2c", r"1099", r"interim",
+            r"\d+\s*(?:-\s*\d+\s*)?months?(?:\s+assignment)?",
+        ],
+        "fullTime": [r"full[- ]?time", r"permanent", r"perm", r"fte", r"salaried"],
+    },
+    "workSettings": {
+        "hybrid": [
+            r"hybrid", r"partially remote", r"partly remote", r"flexible working",
+            r"\d\s*(?:-\s*\d\s*)?days?\s*(?:a|per)\s*week\s*(?:in|on)[- ]?(?:the\s*)?(?:office|site)",
+        ],
+        "onSite": [
+            r"(?:not|no)\s+(?:a\s+)?remote", r"on[- ]?site", r"in[- ]office", r"in the office", r"office[- ]based",
+            r"in[- ]person", r"on location",
+        ],
+        "remote": [
+            r"(?:fully |100% )?remote", r"work(?:ing)? from home", r"wfh", r"telecommut\w*", r"home[- ]based",
+            r"work from anywhere", r"distributed team",
+        ],
+    },
+    "experienceLevel": {
+        "beginner": [
+            r"junior", r"jr", r"entry[- ]level", r"graduate", r"grad", r"intern(?:ship)?", r"trainee",
+            r"apprentice(?:ship)?", r"no experience",
+        ],
+        "intermediate": [r"mid[- ]?level", r"mid[- ]senior", r"intermediate", r"associate"],
+        "expert": [
+            r"principal", r"lead", r"staff", r"head of", r"director", r"chief", r"expert", r"distinguished",
+            r"vp", r"vice president", r"fellow",
+        ],
+        "experienced": [r"senior", r"sr", r"experienced", r"seasoned"],
+    },
+    "category": {
+        "sales": [
+            r"pre[- ]?sales", r"sales", r"account (?:executive|manager|director)", r"business development",
+            r"bdr", r"sdr", r"customer success manager",
+        ],
+        "architect": [r"architect\w*"],
+        "consultant": [r"consult\w*", r"functional", r"advisor", r"implementation specialist"],
+        "administrator": [
+            r"admin(?:istrator)?", r"system(?:s)? admin\w*", r"help ?desk", r"service desk", r"support specialist",
+        ],
+        "analytics": [
+            r"analytics?", r"data analyst", r"bi (?:developer|analyst)", r"power bi", r"business intelligence",
+            r"data scien\w*", r"reporting analyst",
+        ],
+        "automation": [r"power automate", r"automation", r"rpa", r"workflow"],
+        "developer": [r"developer", r"programmer", r"dev", r"x\+\+ developer", r"coder", r"software development"],
+        "engineer": [r"engineer(?:ing)?", r"devops", r"sre"],
+    },
+}
+
+# "3+ years", "5-7 years of experience": minimum years -> experienceLevel
+YEARS_PATTERN = re.compile(r"\b(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years?|yrs?)\b", re.I)
+YEARS_LEVELS = ((1, "beginner"), (4, "intermediate"), (7, "experienced"), (99, "expert"))
+
+
+class Prediction(NamedTuple):
+    label: str
+    confidence: float
+
+
+def _compile(table):
+    groups = "|".join(
+        f"(?P<{label}>{'|'.join(patterns)})" for label, patterns in table.items()
+    )
+    return re.compile(rf"\b(?:{groups})\b", re.I)
+
+
+PATTERNS = {field: _compile(table) for field, table in KEYWORDS.items()}
+
+
+def _hits(pattern, text):
+    counts = {}
+    for match in pattern.finditer(text or ""):
+        counts[match.lastgroup] = counts.get(match.lastgroup, 0) + 1
+    return counts
+
+
+def _years_level(text):
+    years = [int(match.group(1)) for match in YEARS_PATTERN.finditer(text or "")]
+    if not years:
+        return None
+    # "at least 3 years", the smallest requirement is the level's floor
+    least = min(years)
+    return next(level for limit, level in YEARS_LEVELS if least <= limit)
+
+
+def _confidence(scores):
+    ranked = sorted(scores.values(), reverse=True)
+    top = ranked[0]
+    second = ranked[1] if len(ranked) > 1 else 0
+    # more evidence -> surer, a close runner-up -> less sure
+    strength = 1 - math.exp(-top / 2)
+    margin = (top - second) / top
+    return round(strength * (0.5 + 0.5 * margin), 3)
+
+
+def classify_rules(title, description=""):
+    """{field: Prediction} from the keyword tables alone"""
+    predictions = {}
+    for field, pattern in PATTERNS.items():
+        scores = {label: count * TITLE_WEIGHT for label, count in _hits(pattern, title).items()}
+        if field not in TITLE_ONLY_FIELDS:
+            for label, count in _hits(pattern, description).items():
+                scores[label] = scores.get(label, 0) + min(count, MAX_DESCRIPTION_HITS)
+        if field == "experienceLevel":
+            level = _years_level(description)
+            if level:
+                scores[level] = scores.get(level, 0) + 2
+        if not scores:
+            predictions[field] = Prediction(DEFAULTS[field], 0.0)
+            continue
+        best = max(scores, key=scores.get)
+        predictions[field] = Prediction(best, _confidence(scores))
+    return predictions
+
+
+def _model_text(title, description):
+    return f"{title} {title} {title} {description or ''}"
+
+
+@lru_cache(maxsize=1)
+def load_model(path=MODEL_PATH):
+    """The trained {field: pipeline} model, or None without a saved model or scikit-learn"""
+    if not os.path.exists(path):
+        return None
+    try:
+        import joblib
+
+        return joblib.load(path)
+    except Exception:
+        return None
+
+
+def train_model(rows, path=MODEL_PATH, min_examples=5):
+    """
+    Fit one TF-IDF + logistic regression pipeline per field and save them.
+
+    rows: (title, description, {field: label}) tuples, e.g. from the job table.
+    Labels outside LABELS and classes with fewer than min_examples rows are
+    left out. Returns {field: number of training rows}.
+    """
+    import joblib
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+
+    rows = list(rows)
+    model, trained = {}, {}
+    for field, labels in LABELS.items():
+        examples = [
+            (_model_text(title, description), values.get(field))
+            for title, description, values in rows if values.get(field) in labels and values.get(field)
+        ]
+        counts = {}
+        for _, label in examples:
+            counts[label] = counts.get(label, 0) + 1
+        examples = [(text, label) for text, label in examples if counts[label] >= min_examples]
+        if len({label for _, label in examples}) < 2:
+            continue
+        pipeline = make_pipeline(
+            TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_features=50000, sublinear_tf=True),
+            LogisticRegression(max_iter=1000, class_weight="balanced"),
+        )
+        pipeline.fit([text for text, _ in examples], [label for _, label in examples])
+        model[field] = pipeline
+        trained[field] = len(examples)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    joblib.dump(model, path)
+    load_model.cache_clear()
+    return trained
+
+
+def _blend(rule, learned):
+    if rule.label == learned.label:
+        # two independent sources agreeing
+        return Prediction(rule.label, round(1 - (1 - rule.confidence) * (1 - learned.confidence), 3))
+    winner, loser = (rule, learned) if rule.confidence >= learned.confidence else (learned, rule)
+    return Prediction(winner.label, round(max(0.0, winner.confidence - loser.confidence / 2), 3))
+
+
+def classify(title, description="", model=None):
+    """{field: Prediction} from the keyword tables, blended with the trained model if there is one"""
+    predictions = classify_rules(title, description)
+    model = model if model is not None else load_model()
+    if not model:
+        return predictions
+    text = _model_text(title, description)
+    for field, pipeline in model.items():
+        probabilities = pipeline.predict_proba([text])[0]
+        best = probabilities.argmax()
+        learned = Prediction(str(pipeline.classes_[best]), float(probabilities[best]))
+        predictions[field] = _blend(predictions[field], learned)
+    return predictions
+
+
+def confident_fields(predictions, threshold=CONFIDENCE_THRESHOLD):
+    return tuple(field for field, prediction in predictions.items() if prediction.confidence >= threshold)
+
+
+def classify_job(job, asked=(), threshold=CONFIDENCE_THRESHOLD, known=None):
+    """
+    Copy of a JobData record with the classified fields filled in.
+
+    asked: fields the LLM was asked for; its answer is kept when it is a valid
+    label and the classifier is below threshold. known: {field: Prediction}
+    made earlier, e.g. from the list page's title, which may say "(Remote)"
+    where the detail page doesn't; the surer of the two wins.
+    classificationConfidence is the lowest confidence of the four fields.
+    """
+    predictions = classify(job.title, job.description)
+    for field, prediction in (known or {}).items():
+        if field in predictions and prediction.confidence > predictions[field].confidence:
+            predictions[field] = prediction
+    update = {"classificationConfidence": min(prediction.confidence for prediction in predictions.values())}
+    for field, prediction in predictions.items():
+        current = getattr(job, field)
+        if field in asked and current and current in LABELS[field] and prediction.confidence < threshold:
+            continue
+        update[field] = prediction.label
+    return job.model_copy(update=update)
@@ -1,6 +1,8 @@
 import os
 import smtplib
+import threading
 from email.mime.text import MIMEText
+from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 
@@ -11,26 +13,58 @@ MAIL_FROM = os.getenv("MAIL_FROM")
 MAIL_FROM_NAME = os.getenv("MAIL_FROM_NAME")
 MAIL_PORT = int(os.getenv("MAIL_PORT", 587))  # Ensure port is int, default to 587
 MAIL_SERVER = os.getenv("MAIL_SERVER")
-print('fgfg', MAIL_FROM)
 
-def send_completion_email(subject, body, to_email):
+# one logged-in connection for the whole process, see _smtp()
+_server = None
+_lock = threading.Lock()
+
+
+def _smtp():
+    """Reuse the open SMTP session while the server still answers, reconnect otherwise"""
+    global _server
+    if _server is not None:
+        try:
+            if _server.noop()[0] == 250:
+                return _server
+        except (smtplib.SMTPException, OSError):
+            pass
+        close_smtp()
+    server = smtplib.SMTP(MAIL_SERVER, MAIL_PORT, timeout=30)
+    server.starttls()
+    server.login(MAIL_USERNAME, MAIL_PASSWORD)
+    _server = server
+    return server
+
+
+def close_smtp():
+    global _server
+    if _server is None:
+        return
+    try:
+        _server.quit()
+    except (smtplib.SMTPException, OSError):
+        _server.close()
+    _server = None
+
+
+def send_completion_email(subject, body, to_email, attachments=None):
+    """attachments: (filename, bytes) pairs"""
     msg = MIMEMultipart()
     msg["From"] = MAIL_FROM
     msg["To"] = to_email
     msg["Subject"] = subject
 
     msg.attach(MIMEText(body, "plain"))
+    for filename, content in attachments or []:
+        part = MIMEApplication(content, Name=filename)
+        part["Content-Disposition"] = f'attachment; filename="{filename}"'
+        msg.attach(part)
 
     try:
-        with smtplib.SMTP(MAIL_SERVER, MAIL_PORT) as server:
-            server.starttls()
-            server.login(MAIL_USERNAME, MAIL_PASSWORD)
-            server.sendmail(MAIL_FROM, to_email, msg.as_string())
+        with _lock:
+            _smtp().sendmail(MAIL_FROM, to_email, msg.as_string())
         print("✅ Completion email sent.")
+        return True
     except Exception as e:
         print(f"❌ Failed to send email: {e}")
-
-
-   
-    
-    
\ No newline at end of file
+        return False
@@ -1,13 +1,14 @@
 from datetime import datetime
+from core.job_detail_model import JobData
 KEYWORDS = ["power platform", "power automate", "power apps", "dynamics 365", "d365", "crm", "erp"]
 
-def is_relevant_job(job: dict) -> bool:
-    title = (job.get("title") or "").lower()
-    desc = (job.get("description") or "").lower()
+def is_relevant_job(job: JobData) -> bool:
+    title = job.title.lower()
+    desc = job.description.lower()
     if not any(k in title or k in desc for k in KEYWORDS):
         return False
 
-    date_str = job.get("postedDate")
+    date_str = job.postedDate
     if date_str:
         try:
             posted_date = datetime.strptime(date_str, "%Y-%m-%d")
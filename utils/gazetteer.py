@@ -0,0 +1,301 @@
+"""
+Embedded place names for utils.location.
+
+Aliases are "|" separated, the first one is the canonical name. Short
+all-letter aliases (US, NJ, GBR...) only match when written in capitals,
+so "in" or "de" inside free text never turn into Indiana or Germany.
+"""
+
+COUNTRIES = [
+    "United States|US|USA|U.S.|U.S.A.|United States of America|America|Estados Unidos",
+    "Canada|CA|CAN",
+    "United Kingdom|UK|GB|GBR|U.K.|Great Britain|Britain",
+    "Ireland|IE|IRL|Republic of Ireland",
+    "Germany|DE|DEU|Deutschland",
+    "France|FR|FRA",
+    "Netherlands|NL|NLD|The Netherlands|Holland",
+    "Belgium|BE|BEL",
+    "Luxembourg|LU|LUX",
+    "Switzerland|CH|CHE|Schweiz|Suisse",
+    "Austria|AT|AUT|Österreich",
+    "Spain|ES|ESP|España",
+    "Portugal|PT|PRT",
+    "Italy|IT|ITA|Italia",
+    "Denmark|DK|DNK|Danmark",
+    "Sweden|SE|SWE|Sverige",
+    "Norway|NO|NOR|Norge",
+    "Finland|FI|FIN|Suomi",
+    "Iceland|IS|ISL",
+    "Poland|PL|POL|Polska",
+    "Czech Republic|CZ|CZE|Czechia",
+    "Slovakia|SK|SVK",
+    "Hungary|HU|HUN",
+    "Romania|RO|ROU",
+    "Bulgaria|BG|BGR",
+    "Greece|GR|GRC",
+    "Croatia|HR|HRV",
+    "Serbia|RS|SRB",
+    "Slovenia|SI|SVN",
+    "Estonia|EE|EST",
+    "Latvia|LV|LVA",
+    "Lithuania|LT|LTU",
+    "Ukraine|UA|UKR",
+    "Turkey|TR|TUR|Türkiye|Turkiye",
+    "Israel|IL|ISR",
+    "United Arab Emirates|AE|ARE|UAE|U.A.E.|Emirates",
+    "Saudi Arabia|SA|SAU|KSA",
+    "Qatar|QA|QAT",
+    "Kuwait|KW|KWT",
+    "Bahrain|BH|BHR",
+    "Oman|OM|OMN",
+    "Egypt|EG|EGY",
+    "Morocco|MA|MAR",
+    "South Africa|ZA|ZAF|RSA",
+    "Nigeria|NG|NGA",
+    "Kenya|KE|KEN",
+    "Ghana|GH|GHA",
+    "India|IN|IND|Bharat",
+    "Pakistan|PK|PAK",
+    "Bangladesh|BD|BGD",
+    "Sri Lanka|LK|LKA",
+    "Singapore|SG|SGP",
+    "Malaysia|MY|MYS",
+    "Indonesia|ID|IDN",
+    "Philippines|PH|PHL|The Philippines",
+    "Thailand|TH|THA",
+    "Vietnam|VN|VNM|Viet Nam",
+    "China|CN|CHN|PRC|People's Republic of China",
+    "Hong Kong|HK|HKG",
+    "Taiwan|TW|TWN",
+    "Japan|JP|JPN",
+    "South Korea|KR|KOR|Korea|Republic of Korea",
+    "Australia|AU|AUS",
+    "New Zealand|NZ|NZL",
+    "Mexico|MX|MEX|México",
+    "Brazil|BR|BRA|Brasil",
+    "Argentina|AR|ARG",
+    "Chile|CL|CHL",
+    "Colombia|CO|COL",
+    "Peru|PE|PER",
+    "Costa Rica|CR|CRI",
+    "Puerto Rico|PR|PRI",
+    "Georgia|GE|GEO",
+]
+
+# (country, ["State|ABBR|alias", ...])
+STATES = [
+    ("United States", [
+        "Alabama|AL", "Alaska|AK", "Arizona|AZ", "Arkansas|AR", "California|CA|Calif", "Colorado|CO",
+        "Connecticut|CT", "Delaware|DE", "District of Columbia|DC|D.C.", "Florida|FL", "Georgia|GA",
+        "Hawaii|HI", "Idaho|ID", "Illinois|IL", "Indiana|IN", "Iowa|IA", "Kansas|KS", "Kentucky|KY",
+        "Louisiana|LA", "Maine|ME", "Maryland|MD", "Massachusetts|MA|Mass", "Michigan|MI",
+        "Minnesota|MN", "Mississippi|MS", "Missouri|MO", "Montana|MT", "Nebraska|NE", "Nevada|NV",
+        "New Hampshire|NH", "New Jersey|NJ", "New Mexico|NM", "New York|NY|New York State",
+        "North Carolina|NC", "North Dakota|ND", "Ohio|OH", "Oklahoma|OK", "Oregon|OR",
+        "Pennsylvania|PA", "Rhode Island|RI", "South Carolina|SC", "South Dakota|SD", "Tennessee|TN",
+        "Texas|TX", "Utah|UT", "Vermont|VT", "Virginia|VA", "Washington|WA|Washington State",
+        "West Virginia|WV", "Wisconsin|WI", "Wyoming|WY",
+    ]),
+    ("Canada", [
+        "Alberta|AB", "British Columbia|BC", "Manitoba|MB", "New Brunswick|NB",
+        "Newfoundland and Labrador|NL|Newfoundland", "Nova Scotia|NS", "Ontario|ON", "Prince Edward Island|PE|PEI",
+        "Quebec|QC|Québec", "Saskatchewan|SK", "Northwest Territories|NT", "Nunavut|NU", "Yukon|YT",
+    ]),
+    ("United Kingdom", ["England", "Scotland", "Wales", "Northern Ireland"]),
+    ("Australia", [
+        "New South Wales|NSW", "Victoria|VIC", "Queensland|QLD", "Western Australia|WA",
+        "South Australia|SA", "Tasmania|TAS", "Australian Capital Territory|ACT", "Northern Territory|NT",
+    ]),
+    ("India", [
+        "Karnataka|KA", "Maharashtra|MH", "Telangana|TS", "Tamil Nadu|TN", "Haryana|HR", "Delhi|DL|NCR|Delhi NCR",
+        "West Bengal|WB", "Uttar Pradesh|UP", "Gujarat|GJ", "Kerala|KL", "Andhra Pradesh|AP", "Rajasthan|RJ",
+    ]),
+]
+
+# (country, state, "City|alias")
+CITIES = [
+    ("United States", "New York", "New York|NYC|New York City|Manhattan|Brooklyn"),
+    ("United States", "California", "Los Angeles|LA|L.A."),
+    ("United States", "California", "San Francisco|SF|San Fran"),
+    ("United States", "California", "San Jose"),
+    ("United States", "California", "San Diego"),
+    ("United States", "California", "Irvine"),
+    ("United States", "California", "Sacramento"),
+    ("United States", "California", "Oakland"),
+    ("United States", "California", "Palo Alto"),
+    ("United States", "Illinois", "Chicago"),
+    ("United States", "Texas", "Houston"),
+    ("United States", "Texas", "Dallas"),
+    ("United States", "Texas", "Austin"),
+    ("United States", "Texas", "San Antonio"),
+    ("United States", "Texas", "Fort Worth"),
+    ("United States", "Texas", "Plano"),
+    ("United States", "Texas", "Irving"),
+    ("United States", "Arizona", "Phoenix"),
+    ("United States", "Arizona", "Scottsdale"),
+    ("United States", "Arizona", "Tempe"),
+    ("United States", "Pennsylvania", "Philadelphia|Philly"),
+    ("United States", "Pennsylvania", "Pittsburgh"),
+    ("United States", "Florida", "Miami"),
+    ("United States", "Florida", "Orlando"),
+    ("United States", "Florida", "Tampa"),
+    ("United States", "Florida", "Jacksonville"),
+    ("United States", "Florida", "Fort Lauderdale"),
+    ("United States", "Georgia", "Atlanta"),
+    ("United States", "Georgia", "Alpharetta"),
+    ("United States", "Massachusetts", "Boston"),
+    ("United States", "Washington", "Seattle"),
+    ("United States", "Washington", "Redmond"),
+    ("United States", "Washington", "Bellevue"),
+    ("United States", "District of Columbia", "Washington|Washington DC|Washington D.C."),
+    ("United States", "Virginia", "Arlington"),
+    ("United States", "Virginia", "Reston"),
+    ("United States", "Virginia", "Richmond"),
+    ("United States", "Colorado", "Denver"),
+    ("United States", "Colorado", "Boulder"),
+    ("United States", "Minnesota", "Minneapolis"),
+    ("United States", "Minnesota", "Saint Paul|St. Paul|St Paul"),
+    ("United States", "Michigan", "Detroit"),
+    ("United States", "Ohio", "Columbus"),
+    ("United States", "Ohio", "Cleveland"),
+    ("United States", "Ohio", "Cincinnati"),
+    ("United States", "North Carolina", "Charlotte"),
+    ("United States", "North Carolina", "Raleigh"),
+    ("United States", "Tennessee", "Nashville"),
+    ("United States", "Oregon", "Portland"),
+    ("United States", "Nevada", "Las Vegas"),
+    ("United States", "Utah", "Salt Lake City"),
+    ("United States", "Missouri", "Kansas City"),
+    ("United States", "Missouri", "Saint Louis|St. Louis|St Louis"),
+    ("United States", "Indiana", "Indianapolis"),
+    ("United States", "Wisconsin", "Milwaukee"),
+    ("United States", "Maryland", "Baltimore"),
+    ("United States", "New Jersey", "Newark"),
+    ("United States", "New Jersey", "Jersey City"),
+    ("United States", "Connecticut", "Hartford"),
+    ("United States", "Louisiana", "New Orleans"),
+    ("Canada", "Ontario", "Toronto"),
+    ("Canada", "Ontario", "Ottawa"),
+    ("Canada", "Ontario", "Mississauga"),
+    ("Canada", "Quebec", "Montreal|Montréal"),
+    ("Canada", "British Columbia", "Vancouver"),
+    ("Canada", "Alberta", "Calgary"),
+    ("Canada", "Alberta", "Edmonton"),
+    ("Canada", "Manitoba", "Winnipeg"),
+    ("United Kingdom", "England", "London|Greater London"),
+    ("United Kingdom", "England", "Manchester"),
+    ("United Kingdom", "England", "Birmingham"),
+    ("United Kingdom", "England", "Leeds"),
+    ("United Kingdom", "England", "Bristol"),
+    ("United Kingdom", "England", "Reading"),
+    ("United Kingdom", "England", "Liverpool"),
+    ("United Kingdom", "England", "Newcastle|Newcastle upon Tyne"),
+    ("United Kingdom", "England", "Cambridge"),
+    ("United Kingdom", "England", "Milton Keynes"),
+    ("United Kingdom", "Scotland", "Edinburgh"),
+    ("United Kingdom", "Scotland", "Glasgow"),
+    ("United Kingdom", "Wales", "Cardiff"),
+    ("United Kingdom", "Northern Ireland", "Belfast"),
+    ("Ireland", "", "Dublin"),
+    ("Ireland", "", "Cork"),
+    ("Germany", "", "Berlin"),
+    ("Germany", "", "Munich|München|Muenchen"),
+    ("Germany", "", "Frankfurt|Frankfurt am Main"),
+    ("Germany", "", "Hamburg"),
+    ("Germany", "", "Cologne|Köln|Koeln"),
+    ("Germany", "", "Düsseldorf|Dusseldorf|Duesseldorf"),
+    ("Germany", "", "Stuttgart"),
+    ("Netherlands", "", "Amsterdam"),
+    ("Netherlands", "", "Rotterdam"),
+    ("Netherlands", "", "Utrecht"),
+    ("Netherlands", "", "The Hague|Den Haag"),
+    ("Belgium", "", "Brussels|Bruxelles|Brussel"),
+    ("Belgium", "", "Antwerp|Antwerpen"),
+    ("Luxembourg", "", "Luxembourg City"),
+    ("France", "", "Paris"),
+    ("France", "", "Lyon"),
+    ("Spain", "", "Madrid"),
+    ("Spain", "", "Barcelona"),
+    ("Spain", "", "Valencia"),
+    ("Portugal", "", "Lisbon|Lisboa"),
+    ("Portugal", "", "Porto"),
+    ("Italy", "", "Milan|Milano"),
+    ("Italy", "", "Rome|Roma"),
+    ("Switzerland", "", "Zurich|Zürich"),
+    ("Switzerland", "", "Geneva|Genève"),
+    ("Switzerland", "", "Basel"),
+    ("Austria", "", "Vienna|Wien"),
+    ("Denmark", "", "Copenhagen|København"),
+    ("Sweden", "", "Stockholm"),
+    ("Sweden", "", "Gothenburg|Göteborg"),
+    ("Norway", "", "Oslo"),
+    ("Finland", "", "Helsinki"),
+    ("Poland", "", "Warsaw|Warszawa"),
+    ("Poland", "", "Krakow|Kraków|Cracow"),
+    ("Poland", "", "Wroclaw|Wrocław"),
+    ("Czech Republic", "", "Prague|Praha"),
+    ("Hungary", "", "Budapest"),
+    ("Romania", "", "Bucharest|București"),
+    ("Greece", "", "Athens"),
+    ("Turkey", "", "Istanbul|İstanbul"),
+    ("Israel", "", "Tel Aviv"),
+    ("United Arab Emirates", "", "Dubai"),
+    ("United Arab Emirates", "", "Abu Dhabi"),
+    ("Saudi Arabia", "", "Riyadh"),
+    ("Saudi Arabia", "", "Jeddah"),
+    ("Qatar", "", "Doha"),
+    ("Egypt", "", "Cairo"),
+    ("South Africa", "", "Johannesburg|Joburg"),
+    ("South Africa", "", "Cape Town"),
+    ("South Africa", "", "Durban"),
+    ("Nigeria", "", "Lagos"),
+    ("Nigeria", "", "Abuja"),
+    ("Kenya", "", "Nairobi"),
+    ("Ghana", "", "Accra"),
+    ("India", "Karnataka", "Bengaluru|Bangalore"),
+    ("India", "Maharashtra", "Mumbai|Bombay"),
+    ("India", "Maharashtra", "Pune"),
+    ("India", "Telangana", "Hyderabad"),
+    ("India", "Tamil Nadu", "Chennai|Madras"),
+    ("India", "Delhi", "New Delhi"),
+    ("India", "Haryana", "Gurugram|Gurgaon"),
+    ("India", "Uttar Pradesh", "Noida"),
+    ("India", "West Bengal", "Kolkata|Calcutta"),
+    ("India", "Gujarat", "Ahmedabad"),
+    ("India", "Kerala", "Kochi|Cochin"),
+    ("Pakistan", "", "Karachi"),
+    ("Pakistan", "", "Lahore"),
+    ("Sri Lanka", "", "Colombo"),
+    ("Singapore", "", "Singapore"),
+    ("Malaysia", "", "Kuala Lumpur|KL"),
+    ("Philippines", "", "Manila|Metro Manila"),
+    ("Philippines", "", "Cebu|Cebu City"),
+    ("Thailand", "", "Bangkok"),
+    ("Vietnam", "", "Ho Chi Minh City|Saigon"),
+    ("Hong Kong", "", "Hong Kong"),
+    ("China", "", "Shanghai"),
+    ("China", "", "Beijing"),
+    ("China", "", "Shenzhen"),
+    ("Japan", "", "Tokyo"),
+    ("Japan", "", "Osaka"),
+    ("South Korea", "", "Seoul"),
+    ("Australia", "New South Wales", "Sydney"),
+    ("Australia", "Victoria", "Melbourne"),
+    ("Australia", "Queensland", "Brisbane"),
+    ("Australia", "Western Australia", "Perth"),
+    ("Australia", "South Australia", "Adelaide"),
+    ("Australia", "Australian Capital Territory", "Canberra"),
+    ("New Zealand", "", "Auckland"),
+    ("New Zealand", "", "Wellington"),
+    ("Mexico", "", "Mexico City|CDMX|Ciudad de México"),
+    ("Mexico", "", "Guadalajara"),
+    ("Mexico", "", "Monterrey"),
+    ("Brazil", "", "São Paulo|Sao Paulo"),
+    ("Brazil", "", "Rio de Janeiro"),
+    ("Argentina", "", "Buenos Aires"),
+    ("Chile", "", "Santiago"),
+    ("Colombia", "", "Bogotá|Bogota"),
+    ("Colombia", "", "Medellín|Medellin"),
+    ("Peru", "", "Lima"),
+    ("Costa Rica", "", "San José"),
+]
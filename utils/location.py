@@ -0,0 +1,197 @@
+"""
+Local location normalization.
+
+Turns free-form locations ("NYC", "Austin, TX", "Remote - US", "Bengaluru,
+IN") into canonical location / city / state / country values using the
+embedded gazetteer in utils.gazetteer instead of asking the LLM. Place names
+are indexed in a token trie for longest-match lookups and results are
+memoized, so repeated locations cost a dict lookup.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import NamedTuple
+
+from utils.gazetteer import CITIES, COUNTRIES, STATES
+
+# when a name is several kinds of place and the context doesn't decide
+KIND_PRIORITY = {"city": 3, "state": 2, "country": 1}
+REMOTE_WORDS = {"remote", "anywhere", "worldwide", "wfh", "telecommute", "distributed"}
+# free text that is never a city name
+NOT_A_CITY = REMOTE_WORDS | {
+    "hybrid", "onsite", "on site", "on-site", "office", "multiple locations", "various", "nationwide", "home based",
+}
+
+ALTERNATIVES = re.compile(r"\s*(?:;|\||/|\n|\bor\b)\s*", re.I)
+PARTS = re.compile(r"\s*(?:,|\(|\)|\s-\s|–|—|·)\s*")
+TOKENS = re.compile(r"[\w']+")
+
+
+class Place(NamedTuple):
+    kind: str
+    name: str
+    state: str
+    country: str
+
+
+class NormalizedLocation(NamedTuple):
+    location: str
+    city: str
+    state: str
+    country: str
+
+
+def _fold(text):
+    """lowercase, without accents or dots (U.S. -> us, St. Louis -> st louis)"""
+    text = unicodedata.normalize("NFKD", text.replace(".", ""))
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def _add(trie, alias, place):
+    tokens = TOKENS.findall(_fold(alias))
+    if not tokens:
+        return
+    # bare codes (US, NJ, GBR) have to be written in capitals to match
+    is_code = len(tokens) == 1 and tokens[0].isalpha() and len(tokens[0]) <= 3
+    node = trie
+    for token in tokens:
+        node = node.setdefault(token, {})
+    entries = node.setdefault("", [])
+    if (place, is_code) not in entries:
+        entries.append((place, is_code))
+
+
+@lru_cache(maxsize=1)
+def _trie():
+    trie = {}
+    for line in COUNTRIES:
+        aliases = line.split("|")
+        place = Place("country", aliases[0], "", aliases[0])
+        for alias in aliases:
+            _add(trie, alias, place)
+    for country, states in STATES:
+        for line in states:
+            aliases = line.split("|")
+            place = Place("state", aliases[0], aliases[0], country)
+            for alias in aliases:
+                _add(trie, alias, place)
+    for country, state, line in CITIES:
+        aliases = line.split("|")
+        place = Place("city", aliases[0], state, country)
+        for alias in aliases:
+            _add(trie, alias, place)
+    return trie
+
+
+def _match_part(part):
+    """Longest gazetteer matches in one comma separated part: [[candidate places], ...]"""
+    originals = TOKENS.findall(part.replace(".", ""))
+    tokens = [_fold(token) for token in originals]
+    trie = _trie()
+    groups = []
+    i = 0
+    while i < len(tokens):
+        node, best, best_end = trie, None, i
+        for j in range(i, len(tokens)):
+            node = node.get(tokens[j])
+            if node is None:
+                break
+            if "" in node:
+                upper = all(original.isupper() for original in originals[i:j + 1])
+                candidates = [place for place, is_code in node[""] if not is_code or upper]
+                if candidates:
+                    best, best_end = candidates, j + 1
+        if best:
+            groups.append(best)
+            i = best_end
+        else:
+            i += 1
+    return groups
+
+
+def _compatible(a, b):
+    a_city = a.name if a.kind == "city" else ""
+    b_city = b.name if b.kind == "city" else ""
+    return a.country == b.country and (not a.state or not b.state or a.state == b.state) and (
+        not a_city or not b_city or a_city == b_city
+    )
+
+
+def _choose(groups):
+    chosen = []
+    for index, candidates in enumerate(groups):
+        others = [group for other, group in enumerate(groups) if other != index]
+        chosen.append(max(candidates, key=lambda place: (
+            sum(any(_compatible(place, other) for other in group) for group in others),
+            KIND_PRIORITY[place.kind],
+        )))
+    return chosen
+
+
+def _city_text(part):
+    text = " ".join(part.split())
+    if not text or _fold(text) in NOT_A_CITY or len(text.split()) > 4 or not re.fullmatch(r"[^\W\d_][\w' .-]*", text):
+        return ""
+    return text if not text.islower() and not text.isupper() else text.title()
+
+
+@lru_cache(maxsize=16384)
+def normalize_location(text):
+    """Canonical (location, city, state, country) for a free-form location; unknown parts stay empty"""
+    text = (text or "").strip()
+    if not text:
+        return NormalizedLocation("", "", "", "")
+    remote = bool(REMOTE_WORDS & set(TOKENS.findall(_fold(text))))
+
+    groups, parts = [], []
+    for alternative in ALTERNATIVES.split(text):
+        parts = [part for part in PARTS.split(alternative) if part.strip()]
+        groups = [group for part in parts for group in _match_part(part)]
+        # several locations listed, the first one that resolves wins
+        if groups:
+            break
+
+    city = state = country = ""
+    for place in _choose(groups):
+        if place.kind == "city" and not city:
+            city, state, country = place.name, state or place.state, country or place.country
+        elif place.kind == "state":
+            state, country = place.name, place.country
+        elif place.kind == "country":
+            if state and country and country != place.country:
+                state = ""
+            country = place.country
+
+    if groups and not city and (state or country):
+        # "Springfield, IL": a city we don't know, qualified by a state we do
+        unmatched = [part for part in parts if not _match_part(part)]
+        city = _city_text(unmatched[0]) if unmatched and parts and unmatched[0] == parts[0] else ""
+
+    if not (city or state or country):
+        return NormalizedLocation("Remote" if remote else text, "", "", "")
+    label = ", ".join(value for value in (city, state, country) if value)
+    if remote and not city:
+        label = f"Remote, {label}"
+    return NormalizedLocation(label, city, state, country)
+
+
+def normalize_job_location(job):
+    """
+    Copy of a JobData record with city, state and country filled from the gazetteer.
+
+    `location` keeps the page's text ("Charlotte, NC or Remote", "Hybrid -
+    Chicago, IL"), the canonical label only fills it in when it is empty.
+    """
+    text = job.location or ", ".join(value for value in (job.city, job.state, job.country) if value)
+    result = normalize_location(text)
+    if not result.country and (job.city or job.state or job.country):
+        # the page's location line didn't resolve, try the separate fields
+        fallback = normalize_location(", ".join(value for value in (job.city, job.state, job.country) if value))
+        if fallback.country:
+            result = fallback
+    return job.model_copy(update={
+        "location": job.location or result.location,
+        "city": result.city or job.city,
+        "state": result.state or job.state,
+        "country": result.country or job.country,
+    })
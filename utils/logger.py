@@ -1,43 +1,159 @@
+import atexit
+import contextvars
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import sys
 from datetime import datetime
 
-def setup_scraping_logger(name, log_file='scraping_job.log', level=logging.INFO):
+LOGGER_NAME = "scraper"
+# fields set with log_context() and copied onto every record
+CONTEXT_FIELDS = ("run_id", "site", "job", "stage")
+# records logged with extra={"sample": True} are kept once per this many per message and site
+SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", 10))
+# shard processes each get their own file, RotatingFileHandler can't share one
+LOG_FILE = os.getenv("SCRAPING_LOG_FILE", "scraping_job.log")
+
+_context = contextvars.ContextVar("log_context", default={})
+_listener = None
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    Attach site/job/stage (or run_id) to every record logged inside the block.
+
+    Backed by a ContextVar, so each asyncio task started inside keeps its own copy.
+    """
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the current log_context() onto the record in the logging thread"""
+
+    def filter(self, record):
+        context = _context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps 1 in `every` sampled INFO/DEBUG records per message and site; the first always passes"""
+
+    def __init__(self, every=SAMPLE_EVERY):
+        super().__init__()
+        self.every = max(1, every)
+        self.seen = {}
+
+    def filter(self, record):
+        if not getattr(record, "sample", False) or record.levelno >= logging.WARNING:
+            return True
+        key = (record.msg, getattr(record, "site", None))
+        count = self.seen.get(key, 0)
+        self.seen[key] = count + 1
+        return count % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ContextTextFormatter(logging.Formatter):
+    """The console format, with any context fields appended as key=value"""
+
+    def format(self, record):
+        line = super().format(record)
+        context = " ".join(
+            f"{field}={getattr(record, field)}" for field in CONTEXT_FIELDS if getattr(record, field, None) is not None
+        )
+        return f"{line} [{context}]" if context else line
+
+
+def _start_listener(log_file):
+    global _listener
+    c_handler = logging.StreamHandler(sys.stdout)  # Console handler
+    f_handler = RotatingFileHandler(               # File handler with rotation, one JSON record per line
+        log_file,
+        maxBytes=1024*1024*5,  # 5MB
+        backupCount=3
+    )
+    c_handler.setFormatter(ContextTextFormatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    f_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    # the listener thread does the console and file I/O, callers only enqueue
+    _listener = QueueListener(log_queue, c_handler, f_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return log_queue
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread; safe to call twice"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_scraping_logger(name=LOGGER_NAME, log_file=LOG_FILE, level=logging.INFO):
     """
     Set up a logger for web scraping jobs with file and console output.
-    
+
+    Records go through a queue to a single listener thread, so logging never
+    blocks the event loop. Calling this again returns the same logger
+    without adding handlers. Other modules log through get_logger().
+
     Args:
-        name (str): Name of the logger (usually __name__)
-        log_file (str): Path to the log file
+        name (str): Name of the logger
+        log_file (str): Path to the JSON lines log file, $SCRAPING_LOG_FILE by default
         level: Logging level (e.g., logging.INFO, logging.DEBUG)
-        
+
     Returns:
         logging.Logger: Configured logger instance
     """
-    # Create a custom logger
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    # Create handlers
-    c_handler = logging.StreamHandler(sys.stdout)  # Console handler
-    f_handler = RotatingFileHandler(               # File handler with rotation
-        log_file, 
-        maxBytes=1024*1024*5,  # 5MB
-        backupCount=3
-    )
-    
-    # Create formatters and add them to handlers
-    log_format = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    c_handler.setFormatter(log_format)
-    f_handler.setFormatter(log_format)
-    
-    # Add handlers to the logger
-    logger.addHandler(c_handler)
-    logger.addHandler(f_handler)
-    
+    if any(getattr(handler, "_scraping_queue", False) for handler in logger.handlers):
+        return logger
+
+    log_queue = _listener.queue if _listener is not None else _start_listener(log_file)
+    handler = QueueHandler(log_queue)
+    handler._scraping_queue = True
+    # filters run before the record is enqueued, while the context is still current
+    handler.addFilter(ContextFilter())
+    handler.addFilter(SamplingFilter())
+    logger.addHandler(handler)
+    # root handlers would print everything a second time
+    logger.propagate = False
     return logger
 
+
+def get_logger(name):
+    """Child of the scraping logger, handled once setup_scraping_logger() has run"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
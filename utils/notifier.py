@@ -1,15 +1,34 @@
-# import yagmail
-# from twilio.rest import Client
-# from config import EMAIL_CONFIG, TWILIO_CONFIG
-
-# def send_email(subject, content):
-#     yag = yagmail.SMTP(EMAIL_CONFIG["sender"], EMAIL_CONFIG["password"])
-#     yag.send(EMAIL_CONFIG["receiver"], subject, content)
-
-# def send_whatsapp_alert(message):
-#     client = Client(TWILIO_CONFIG["account_sid"], TWILIO_CONFIG["auth_token"])
-#     client.messages.create(
-#         body=message,
-#         from_=TWILIO_CONFIG["from_number"],
-#         to=TWILIO_CONFIG["to_number"]
-#     )
\ No newline at end of file
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+# Slack / Teams style incoming webhook, receives {"text": ...} plus the report fields
+REPORT_WEBHOOK_URL = os.getenv("REPORT_WEBHOOK_URL")
+TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
+TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
+TWILIO_FROM = os.getenv("TWILIO_FROM")  # e.g. whatsapp:+14155238886
+TWILIO_TO = os.getenv("TWILIO_TO")
+
+# Twilio rejects WhatsApp bodies above this
+WHATSAPP_MAX_CHARS = 1600
+
+
+def send_webhook(payload, url=None, timeout=15):
+    import requests
+
+    response = requests.post(url or REPORT_WEBHOOK_URL, json=payload, timeout=timeout)
+    response.raise_for_status()
+    print("✅ Report webhook sent.")
+
+
+def send_whatsapp_alert(message):
+    # twilio is optional, only needed once TWILIO_* is configured
+    from twilio.rest import Client
+
+    client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+    client.messages.create(
+        body=message[:WHATSAPP_MAX_CHARS],
+        from_=TWILIO_FROM,
+        to=TWILIO_TO,
+    )
+    print("✅ WhatsApp alert sent.")
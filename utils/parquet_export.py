@@ -0,0 +1,151 @@
+"""
+Columnar export of scraped runs for analytics.
+
+Each run is written as Parquet under exports/run_date=YYYY-MM-DD/company=<name>/
+with one Arrow schema derived from JobData, so files from different nights
+line up. read_runs() opens the whole tree memory-mapped and only touches the
+partitions and row groups a filter can match.
+
+    from utils.parquet_export import read_runs
+    df = read_runs(since="2025-06-01", columns=["title", "country"]).to_pandas()
+"""
+import typing
+from datetime import date, datetime
+from functools import lru_cache
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+
+from core.job_detail_model import JobData
+
+EXPORT_DIR = "exports"
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("run_date", pa.string()), ("company", pa.string())]), flavor="hive"
+)
+
+# JobData annotation -> Arrow type
+ARROW_TYPES = {
+    str: pa.string(),
+    bool: pa.bool_(),
+    float: pa.float64(),
+    list[str]: pa.list_(pa.string()),
+}
+
+# stored typed instead of as the model's ISO string so date filters push down
+OVERRIDES = {
+    "postedDate": pa.timestamp("us"),
+}
+
+
+def _arrow_type(annotation):
+    # Optional[str] -> str
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+        annotation = args[0]
+    return ARROW_TYPES[annotation]
+
+
+@lru_cache(maxsize=None)
+def job_schema():
+    """Arrow schema for one exported job: runId, then the JobData fields in model order"""
+    fields = [pa.field("runId", pa.string(), nullable=False)]
+    for name, info in JobData.model_fields.items():
+        fields.append(pa.field(name, OVERRIDES.get(name) or _arrow_type(info.annotation)))
+    return pa.schema(fields)
+
+
+def dataset_schema():
+    return job_schema().append(pa.field("run_date", pa.string())).append(pa.field("company", pa.string()))
+
+
+def _timestamp(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def jobs_to_table(jobs, run_id, run_date):
+    """JobData list -> Arrow table with the partition columns filled in"""
+    schema = job_schema()
+    columns = {name: [] for name in schema.names}
+    companies = []
+    for job in jobs:
+        record = job.model_dump()
+        record["runId"] = run_id
+        record["postedDate"] = _timestamp(record["postedDate"])
+        for name in schema.names:
+            columns[name].append(record[name])
+        companies.append(job.companyName or "unknown")
+
+    table = pa.table(columns, schema=schema)
+    table = table.append_column("run_date", pa.array([run_date.isoformat()] * len(companies), pa.string()))
+    return table.append_column("company", pa.array(companies, pa.string()))
+
+
+def export_run(jobs, run_id, root=EXPORT_DIR, now=None):
+    """
+    Write one run as partitioned Parquet and return the root directory.
+
+    Files are named after the run, so several runs on the same day sit side
+    by side and re-exporting a run replaces only its own files.
+    """
+    run_date = (now or datetime.now()).date()
+    table = jobs_to_table(jobs, run_id, run_date)
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template=f"{run_id}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="snappy"),
+        max_rows_per_group=10000,
+    )
+    return root
+
+
+def open_runs(root=EXPORT_DIR):
+    """Memory-mapped dataset over every exported run"""
+    return ds.dataset(
+        root,
+        schema=dataset_schema(),
+        format="parquet",
+        partitioning=PARTITIONING,
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def read_runs(root=EXPORT_DIR, columns=None, since=None, until=None, companies=None, filter=None):
+    """
+    Load exported runs as one Arrow table (call .to_pandas() for a DataFrame).
+
+    since/until bound the run date (inclusive) and companies limits the
+    company partitions, so skipped directories are never opened. `filter`
+    takes any further pyarrow.dataset expression, e.g.
+    ds.field("country") == "Canada", which is checked against row group
+    statistics before rows are decoded.
+    """
+    expression = None
+    conditions = []
+    if since:
+        conditions.append(ds.field("run_date") >= _as_date(since))
+    if until:
+        conditions.append(ds.field("run_date") <= _as_date(until))
+    if companies:
+        conditions.append(ds.field("company").isin(list(companies)))
+    if filter is not None:
+        conditions.append(filter)
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return open_runs(root).to_table(columns=columns, filter=expression)
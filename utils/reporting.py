@@ -0,0 +1,184 @@
+"""
+Completion report for a run: failures grouped by site and error class.
+
+build_report() turns the raw failure records into a short summary and a
+gzipped JSON Lines attachment with one line per distinct failure. send_report()
+hands it to every configured sink (email, webhook, WhatsApp) on background
+threads; wait_for_reports() bounds how long shutdown waits for them.
+"""
+import gzip
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+# how many site / error rows the summary lists before "... and N more"
+SUMMARY_ROWS = 15
+SAMPLE_CHARS = 160
+# shutdown waits at most this long for slow sinks
+SEND_TIMEOUT = 60
+
+# error class for failure records written before error_type was stored
+ERROR_PATTERNS = [
+    (re.compile(r"timeout|timed out", re.I), "Timeout"),
+    (re.compile(r"net::(ERR_[A-Z_]+)"), None),
+    (re.compile(r"no jobs found", re.I), "NoJobsFound"),
+    (re.compile(r"captcha|access denied|403", re.I), "Blocked"),
+]
+
+_pending = []
+
+
+def error_class(failure):
+    if failure.get("error_type"):
+        return failure["error_type"]
+    message = str(failure.get("error") or "")
+    for pattern, name in ERROR_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return name or match.group(1)
+    return "Other"
+
+
+def _site(failure):
+    site = failure.get("url")
+    if isinstance(site, dict):
+        return site.get("site_id") or site.get("company_name") or site.get("url") or "unknown", site.get("url") or ""
+    return str(site or "unknown"), str(site or "")
+
+
+def group_failures(failures):
+    """One entry per (site, error class, message), most frequent first"""
+    groups = {}
+    for failure in failures:
+        site, url = _site(failure)
+        kind = error_class(failure)
+        message = str(failure.get("error") or "")
+        key = (site, kind, message)
+        if key not in groups:
+            groups[key] = {"site": site, "url": url, "error_class": kind, "error": message, "count": 0}
+        groups[key]["count"] += 1
+    return sorted(groups.values(), key=lambda group: (-group["count"], group["site"]))
+
+
+def _shorten(text, limit=SAMPLE_CHARS):
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def build_report(jobs_count, load_result, failures, run_id=None):
+    """Summary text, per-site/per-class counts and the compressed failure attachment"""
+    groups = group_failures(failures)
+    by_class = Counter()
+    by_site = Counter()
+    samples = {}
+    for group in groups:
+        by_class[group["error_class"]] += group["count"]
+        key = (group["site"], group["error_class"])
+        by_site[key] += group["count"]
+        samples.setdefault(key, group["error"])
+
+    lines = [
+        f"The job scraping script has finished running{f' (run {run_id})' if run_id else ''}.",
+        "",
+        f"Successful jobs: {jobs_count}",
+        f"Saved jobs: {load_result}",
+        f"Failed jobs: {len(failures)} across {len({site for site, _ in by_site})} sites",
+    ]
+    if by_class:
+        lines += ["", "By error class:"]
+        lines += [f"  {name:<24} {count:>5}" for name, count in by_class.most_common()]
+        lines += ["", "By site:"]
+        for (site, kind), count in by_site.most_common(SUMMARY_ROWS):
+            lines.append(f"  {site:<40} {kind:<20} {count:>5}  {_shorten(samples[(site, kind)])}")
+        if len(by_site) > SUMMARY_ROWS:
+            lines.append(f"  ... and {len(by_site) - SUMMARY_ROWS} more")
+
+    attachments = []
+    if groups:
+        name = f"failed_jobs-{run_id or time.strftime('%Y%m%dT%H%M%S')}.jsonl.gz"
+        payload = "".join(json.dumps(group, ensure_ascii=False) + "\n" for group in groups)
+        attachments.append((name, gzip.compress(payload.encode("utf-8"))))
+        lines += ["", f"Every distinct failure is in the attached {name}."]
+
+    return {
+        "run_id": run_id,
+        "subject": "Job Scraping Completed" + (f" with {len(failures)} failures" if failures else ""),
+        "text": "\n".join(lines),
+        "jobs": jobs_count,
+        "failures": len(failures),
+        "by_class": dict(by_class),
+        "by_site": [
+            {"site": site, "error_class": kind, "count": count} for (site, kind), count in by_site.most_common()
+        ],
+        "attachments": attachments,
+    }
+
+
+def email_sink(report):
+    from utils.email_sender import send_completion_email
+
+    if not send_completion_email(report["subject"], report["text"], os.getenv("MAIL_TO"), report["attachments"]):
+        raise RuntimeError("email not sent")
+
+
+def webhook_sink(report):
+    from utils.notifier import send_webhook
+
+    send_webhook({key: value for key, value in report.items() if key != "attachments"})
+
+
+def whatsapp_sink(report):
+    from utils.notifier import send_whatsapp_alert
+
+    # the summary header only, the per-site table doesn't read well on a phone
+    send_whatsapp_alert(report["text"].split("\n\nBy site:")[0])
+
+
+def configured_sinks():
+    """Sinks whose settings are present in the environment"""
+    sinks = []
+    if os.getenv("MAIL_SERVER") and os.getenv("MAIL_TO"):
+        sinks.append(email_sink)
+    if os.getenv("REPORT_WEBHOOK_URL"):
+        sinks.append(webhook_sink)
+    if os.getenv("TWILIO_ACCOUNT_SID") and os.getenv("TWILIO_TO"):
+        sinks.append(whatsapp_sink)
+    return sinks
+
+
+def _deliver(sink, report, logger):
+    try:
+        sink(report)
+    except Exception as e:
+        message = f"Report sink {sink.__name__} failed: {e}"
+        if logger:
+            logger.error(message)
+        else:
+            print(message)
+
+
+def send_report(report, sinks=None, logger=None):
+    """Start every sink on its own thread and return immediately"""
+    for sink in configured_sinks() if sinks is None else sinks:
+        thread = threading.Thread(target=_deliver, args=(sink, report, logger), name=f"report-{sink.__name__}", daemon=True)
+        thread.start()
+        _pending.append(thread)
+    return len(_pending)
+
+
+def wait_for_reports(timeout=SEND_TIMEOUT):
+    """Join the sink threads for at most `timeout` seconds; returns the ones still running"""
+    deadline = time.monotonic() + timeout
+    for thread in _pending:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    still_running = [thread.name for thread in _pending if thread.is_alive()]
+    _pending.clear()
+    # the SMTP session is shared, only hang up once nothing is sending on it
+    email_sender = sys.modules.get("utils.email_sender")
+    if email_sender and "report-email_sink" not in still_running:
+        email_sender.close_smtp()
+    return still_running
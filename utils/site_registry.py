@@ -0,0 +1,191 @@
+import csv
+import json
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import yaml
+
+SITES_CSV = "treat_static_job.csv"
+SITES_YAML = "sites.yaml"
+SITE_STATS_FILE = "site_stats.json"
+
+# Used when neither sites.yaml nor the CSV say otherwise
+DEFAULT_SETTINGS = {
+    "enabled": True,
+    "fetch_tier": "text",           # "http" (no browser), "text" (browser, no images) or "full"
+    "concurrency": 1,               # detail pages fetched at the same time for this site
+    "page_timeout": 80000,          # list page timeout in ms
+    "detail_timeout": 80000,        # detail page timeout in ms
+    "wait_for": "css:div",
+    "detail_wait_for": "css:h1, p, h5, span",
+    "pagination": "none",           # "none", "scroll" or "load_more"
+    "load_more_selector": "",
+    "max_pages": 1,                 # load_more clicks
+    "extraction_tier": "llm",       # "llm" or "css" (needs selectors, falls back to llm)
+    "selectors": None,              # JsonCssExtractionStrategy schema for the list page
+    "block_resources": True,        # abort images, media, fonts and analytics while rendering
+    "hedge": True,                  # start a second detail fetch when the first runs into the latency tail
+    "logo_url": "",                 # company logo, found on company_website when empty (utils.asset_cache)
+}
+
+# CSV column holding each kind of listing URL
+URL_COLUMNS = {"power": "power_url", "dynamics": "dynamics_url"}
+
+# weight of the newest run in the running averages
+STATS_ALPHA = 0.3
+# raw latencies kept per site for percentile based timeouts
+LATENCY_WINDOW = 50
+
+
+def _escape_css(identifier):
+    return re.sub(r"([^\w-])", r"\\\1", identifier)
+
+
+def normalize_wait_for(raw):
+    """
+    Turn the CSV's wait_for notes into crawl4ai selectors.
+
+    The sheet stores things like class="job-card a" or id="jobs", which
+    crawl4ai cannot use as-is and ends up waiting for the full timeout.
+    """
+    raw = (raw or "").strip()
+    if not raw or raw.startswith(("http://", "https://")):
+        return None
+    if raw.startswith(("css:", "js:")):
+        return raw
+
+    match = re.fullmatch(r'([\w-]+)\s*=\s*"([^"]*)"', raw)
+    if not match:
+        return f"css:{raw}"
+    attribute, value = match.group(1), match.group(2).strip()
+    if attribute == "class" and value:
+        return "css:" + "".join(f".{_escape_css(c)}" for c in value.split())
+    if attribute == "id" and value:
+        return f"css:#{_escape_css(value)}"
+    return f'css:[{attribute}="{value}"]'
+
+
+def _load_overrides(yaml_path):
+    if not yaml_path or not os.path.exists(yaml_path):
+        return {}, {}
+    with open(yaml_path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return data.get("defaults") or {}, data.get("sites") or {}
+
+
+@lru_cache(maxsize=None)
+def _load_registry(csv_path, yaml_path):
+    defaults, overrides = _load_overrides(yaml_path)
+    profiles = []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            company_name = (row.get("company_name") or "").strip()
+            wait_for = normalize_wait_for(row.get("wait_for"))
+            for kind, column in URL_COLUMNS.items():
+                url = (row.get(column) or "").strip()
+                if not url:
+                    continue
+                site_id = f"{company_name}:{kind}"
+                profile = {**DEFAULT_SETTINGS, **defaults}
+                if wait_for:
+                    profile["wait_for"] = wait_for
+                # company-wide overrides first, then the ones for this exact URL
+                profile.update(overrides.get(company_name) or {})
+                profile.update(overrides.get(site_id) or {})
+                profile.update({
+                    "site_id": site_id,
+                    "company_name": company_name,
+                    "company_website": (row.get("company_website") or "").strip(),
+                    "url_type": (row.get("url_type") or "").strip(),
+                    "url_kind": kind,
+                    "url": url,
+                    "domain": urlparse(url).netloc.lower(),
+                })
+                profiles.append(profile)
+    return tuple(profiles)
+
+
+def load_site_profiles(csv_path=SITES_CSV, yaml_path=SITES_YAML, include_disabled=False):
+    """
+    Return one profile dict per configured listing URL (power and dynamics).
+
+    The files are read once per process; each call hands out fresh copies.
+    """
+    return [
+        dict(profile)
+        for profile in _load_registry(csv_path, yaml_path)
+        if include_disabled or profile.get("enabled", True)
+    ]
+
+
+def load_site_stats(path=SITE_STATS_FILE):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (ValueError, OSError):
+        return {}
+
+
+def save_site_stats(stats, path=SITE_STATS_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2, sort_keys=True)
+    return path
+
+
+def _running_average(previous, value):
+    if previous is None:
+        return value
+    return round(previous + STATS_ALPHA * (value - previous), 3)
+
+
+def _append_samples(entry, key, latencies):
+    samples = entry.get(key) or []
+    samples.extend(round(latency * 1000, 1) for latency in latencies)
+    entry[key] = samples[-LATENCY_WINDOW:]
+
+
+def record_site_run(stats, site_id, list_latency, detail_latencies, jobs_found, jobs_saved, domain=None):
+    """Fold one site's run into its running averages (latencies in seconds)"""
+    entry = stats.setdefault(site_id, {"runs": 0})
+    entry["runs"] += 1
+    if domain:
+        entry["domain"] = domain
+    entry["avg_list_latency_ms"] = _running_average(entry.get("avg_list_latency_ms"), list_latency * 1000)
+    _append_samples(entry, "list_latency_samples", [list_latency])
+    if detail_latencies:
+        avg_detail = sum(detail_latencies) / len(detail_latencies) * 1000
+        entry["avg_detail_latency_ms"] = _running_average(entry.get("avg_detail_latency_ms"), avg_detail)
+        _append_samples(entry, "detail_latency_samples", detail_latencies)
+    entry["avg_jobs_found"] = _running_average(entry.get("avg_jobs_found"), jobs_found)
+    if jobs_found:
+        entry["avg_yield"] = _running_average(entry.get("avg_yield"), jobs_saved / jobs_found)
+    entry["last_run"] = datetime.now().isoformat(timespec="seconds")
+    return entry
+
+
+def domain_latency_samples(stats, domain, kind):
+    """Pool the recent list or detail latencies (ms) of every site on a domain"""
+    samples = []
+    if not domain:
+        return samples
+    for entry in stats.values():
+        if entry.get("domain") == domain:
+            samples.extend(entry.get(f"{kind}_latency_samples") or [])
+    return samples
+
+
+def merge_site_stats(paths, path=SITE_STATS_FILE):
+    """Combine per-shard stats files; each site belongs to exactly one shard"""
+    stats = load_site_stats(path)
+    for shard_path in paths:
+        for site_id, entry in load_site_stats(shard_path).items():
+            current = stats.get(site_id)
+            if not current or entry.get("last_run", "") >= current.get("last_run", ""):
+                stats[site_id] = entry
+    save_site_stats(stats, path)
+    return stats
@@ -6,8 +6,9 @@ def save_failed(job):
     with open(FAILED_FILE, 'a') as f:
         f.write(json.dumps(job) + '\n')
 
-def load_failed():
-    if not os.path.exists(FAILED_FILE):
+def load_failed(filename=None):
+    filename = filename or FAILED_FILE
+    if not os.path.exists(filename):
         return []
-    with open(FAILED_FILE) as f:
-        return [json.loads(line.strip()) for line in f]
\ No newline at end of file
+    with open(filename) as f:
+        return [json.loads(line.strip()) for line in f if line.strip()]